@@ -2,10 +2,14 @@ import os
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
+from config.settings import get_settings
+
 config = context.config
 
-# Можно переопределить url из ENV:
-db_url = os.getenv("QA_DB_URL")
+# Можно переопределить url из ENV: QA_DB_URL (только для миграций), иначе
+# DATABASE_URL приложения (config/settings.py) — миграции идут в ту же базу,
+# что и сервис. sqlalchemy.url из alembic.ini — лишь запасной вариант.
+db_url = os.getenv("QA_DB_URL") or get_settings().DATABASE_URL
 if db_url:
     config.set_main_option("sqlalchemy.url", db_url)
 
@@ -31,3 +35,9 @@ def run_migrations_online():
                           target_metadata=target_metadata)
         with context.begin_transaction():
             context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,53 @@
+"""Add indexes for qa_checks / qa_comments lookups
+
+Revision ID: 5d2e8f41a7c3
+Revises: bcb788b97881
+Create Date: 2025-03-01 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8f41a7c3'
+down_revision = 'bcb788b97881'
+branch_labels = None
+depends_on = None
+
+# (имя индекса, таблица, колонки) — совпадают с __table_args__ в db/models.py
+INDEXES = [
+    # find_by_status: WHERE status = ... ORDER BY id DESC
+    ('ix_qa_checks_status_id', 'qa_checks', ['status', 'id']),
+    # mass_delete_old_checks: WHERE updated_at < cutoff
+    ('ix_qa_checks_updated_at', 'qa_checks', ['updated_at']),
+    # list_comments_for_check: WHERE qa_check_id = ... ORDER BY id DESC
+    ('ix_qa_comments_check_id_id', 'qa_comments', ['qa_check_id', 'id']),
+]
+
+
+def upgrade():
+    """
+    Индексы под фильтры репозитория (db/repository.py).
+    В PostgreSQL создаются CONCURRENTLY (вне транзакции), чтобы не блокировать
+    запись в рабочие таблицы. Таблицы, которых ещё нет (создаются init_db()),
+    пропускаются — при create_all индексы возьмутся из моделей.
+    """
+    inspector = sa.inspect(op.get_bind())
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if not inspector.has_table(table):
+                continue
+            op.create_index(name, table, columns, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade():
+    """
+    Откат: удаляем индексы в обратном порядке.
+    """
+    inspector = sa.inspect(op.get_bind())
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            if not inspector.has_table(table):
+                continue
+            op.drop_index(name, table_name=table, if_exists=True,
+                          postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""Store qa_checks.status as String(16) with a CHECK constraint
+
+Revision ID: 8a4c1e9f2b6d
+Revises: 5d2e8f41a7c3
+Create Date: 2025-03-08 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8a4c1e9f2b6d'
+down_revision = '5d2e8f41a7c3'
+branch_labels = None
+depends_on = None
+
+# Значения QACheckStatus (db/models.py)
+STATUSES = ('pending', 'in_progress', 'completed', 'failed')
+CONSTRAINT_NAME = 'ck_qa_checks_status'
+
+
+def upgrade():
+    """
+    Раньше статус писался Enum-колонкой SQLAlchemy, которая хранит ИМЕНА
+    членов ("PENDING"), теперь — значения QACheckStatus ("pending").
+    Переводим существующие строки в нижний регистр, сужаем тип до String(16)
+    и добавляем CHECK-ограничение.
+    """
+    if not sa.inspect(op.get_bind()).has_table('qa_checks'):
+        return
+    op.execute("UPDATE qa_checks SET status = lower(status)")
+    with op.batch_alter_table('qa_checks') as batch_op:
+        batch_op.alter_column('status', type_=sa.String(16),
+                              existing_nullable=False)
+        batch_op.create_check_constraint(
+            CONSTRAINT_NAME,
+            "status IN ({})".format(", ".join(f"'{s}'" for s in STATUSES)),
+        )
+
+
+def downgrade():
+    """
+    Откат: убираем CHECK-ограничение и возвращаем имена Enum ("PENDING").
+    """
+    if not sa.inspect(op.get_bind()).has_table('qa_checks'):
+        return
+    with op.batch_alter_table('qa_checks') as batch_op:
+        batch_op.drop_constraint(CONSTRAINT_NAME, type_='check')
+        batch_op.alter_column('status', type_=sa.String(50),
+                              existing_nullable=False)
+    op.execute("UPDATE qa_checks SET status = upper(status)")
@@ -8,6 +8,7 @@ qa_service/app.py
  - LanguageTool (для проверки текста)
  - SQLAlchemy (db.py + models.py) с Alembic
  - CRUD-операции (repository.py)
+ - Продакшен-запуск: gunicorn + gevent (wsgi.py, gunicorn.conf.py)
 
 Основные эндпоинты (не изменены):
  - GET /health             : простая проверка
@@ -26,22 +27,25 @@ qa_service/app.py
 import re
 import logging
 import subprocess
-from typing import Dict, Any, List, Optional
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from flasgger import Swagger, swag_from
-import language_tool_python
-
 from config.settings import get_settings
 from config.logging_config import setup_logging
 
-from db.db import SessionLocal
+from services.language_tool_client import create_language_tool
+
+from db.db import get_session
 from db.models import QACheckStatus
 from db.repository import (
     create_qa_check,
-    update_qa_check_fields,
     get_qa_check_by_id,
+    get_qa_check_dto,
     list_qa_checks,
     create_qa_comment,
     list_comments_for_check,
@@ -49,10 +53,15 @@ from db.repository import (
 
 # -------- Новая логика: импортируем qa_manager (НЕ удаляем старую) --------
 from logic.qa_manager import perform_qa_check
+from logic.restricted_words_checker import compile_bad_words_pattern
 
 # ------------------------- ЛОГИРОВАНИЕ -------------------------
 setup_logging()
 logger = logging.getLogger("qa_service")
+# Уровень задаётся один раз в setup_logging() выше, поэтому проверку DEBUG
+# кэшируем: горячие эндпоинты (/health, /info, списки) не тратят время на
+# logger.debug(), который в продакшене всё равно ничего не пишет.
+_DEBUG = logger.isEnabledFor(logging.DEBUG)
 
 # ------------------------- НАСТРОЙКИ -------------------------
 settings = get_settings()
@@ -61,8 +70,39 @@ DEBUG_MODE = settings.QA_SERVICE_DEBUG
 LANGUAGE_CODE = settings.QA_SERVICE_LANG
 BAD_WORDS = settings.bad_words_list
 AUTO_CORRECT = settings.QA_SERVICE_AUTO_CORRECT
+MAX_TEXT_LEN = settings.QA_SERVICE_MAX_TEXT_LEN
+MAX_BODY_BYTES = settings.QA_SERVICE_MAX_BODY_BYTES
 DATABASE_URL = settings.DATABASE_URL
 
+
+# Все BAD_WORDS — одним выражением, собранным при старте. Движок (Hyperscan,
+# автомат Ахо-Корасик или альтернация re) и границы слов (\b) — те же, что у
+# logic/restricted_words_checker.py, поэтому результат не зависит от того,
+# какие пакеты установлены.
+BAD_WORDS_PATTERN = compile_bad_words_pattern(BAD_WORDS)
+
+
+# Дешёвый префильтр: большинство текстов не содержит ни одного BAD_WORD,
+# и проверка токенов по frozenset позволяет вообще не запускать поиск.
+# Работает, только если каждое слово — один \w+-токен (без пробелов/дефисов).
+_WORD_TOKEN_RE = re.compile(r"\w+")
+BAD_WORDS_SET: Optional[frozenset] = (
+    frozenset(w.lower() for w in BAD_WORDS)
+    if BAD_WORDS and all(_WORD_TOKEN_RE.fullmatch(w) for w in BAD_WORDS)
+    else None
+)
+
+
+def _mask_bad_words(text: str) -> str:
+    """Заменяет все вхождения BAD_WORDS на '***'."""
+    if BAD_WORDS_SET is not None and BAD_WORDS_SET.isdisjoint(
+            _WORD_TOKEN_RE.findall(text.lower())):
+        return text
+
+    if BAD_WORDS_PATTERN is not None:
+        return BAD_WORDS_PATTERN.sub("***", text)
+    return text
+
 logger.info("=== QA Service app.py START ===")
 logger.info(
     "Settings -> PORT=%d, DEBUG=%s, LANG=%s, AUTO_CORRECT=%s, BAD_WORDS=%s, DB=%s",
@@ -92,15 +132,36 @@ def auto_upgrade_db():
 app = Flask(__name__)
 CORS(app)
 app.config["SWAGGER"] = {"title": "QA Service API", "uiversion": 3}
+# Тело больше MAX_BODY_BYTES Werkzeug отклоняет (413) при чтении, не
+# загружая и не декодируя его целиком
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY_BYTES
 swagger = Swagger(app)
 
 # ------------------------- LANGUAGE TOOL -------------------------
-try:
-    tool = language_tool_python.LanguageTool(LANGUAGE_CODE)
-    logger.info("LanguageTool инициализирован (язык: %s).", LANGUAGE_CODE)
-except Exception as e:
-    logger.error("Ошибка инициализации LanguageTool: %s", e)
-    tool = None
+# При заданном QA_LT_REMOTE_URL это лишь HTTP-клиент к общему серверу
+# (keep-alive пул), а не отдельная JVM в каждом gunicorn-воркере.
+# Инициализация ленивая: воркеры, обслуживающие только /health, /info и
+# /qa-checks, не платят за LanguageTool вовсе.
+_tool = None
+_tool_lock = threading.Lock()
+
+
+def _get_tool():
+    """
+    Возвращает общий LanguageTool, создавая его при первом вызове (потокобезопасно).
+    При ошибке инициализации возвращает None; следующий вызов попробует снова.
+    """
+    global _tool
+    if _tool is None:
+        with _tool_lock:
+            if _tool is None:
+                try:
+                    _tool = create_language_tool(LANGUAGE_CODE)
+                    logger.info(
+                        "LanguageTool инициализирован (язык: %s).", LANGUAGE_CODE)
+                except Exception as e:
+                    logger.error("Ошибка инициализации LanguageTool: %s", e)
+    return _tool
 
 # ------------------------- DB СЕССИЯ -------------------------
 
@@ -110,7 +171,7 @@ def get_db_session():
     Генератор, создающий и закрывающий SQLAlchemy-сессию.
     Используется: db_session = next(get_db_session())
     """
-    db = SessionLocal()
+    db = get_session()
     try:
         yield db
     finally:
@@ -119,39 +180,45 @@ def get_db_session():
 # ------------------------- СТАРАЯ БИЗНЕС-ЛОГИКА (НЕ УДАЛЯЕМ) -------------------------
 
 
-def process_text(text: str) -> Dict[str, Any]:
+# Кэш результатов process_text: повторные проверки одного и того же текста
+# (ретраи, дубли, тестовые пачки) не ходят в LanguageTool повторно.
+# BAD_WORDS и AUTO_CORRECT фиксируются при старте, поэтому ключ — только текст.
+PROCESS_TEXT_CACHE_SIZE = 4096
+
+# (offset, error_text, suggestions)
+_CachedIssue = Tuple[int, str, Tuple[str, ...]]
+
+
+class _LanguageToolUnavailable(Exception):
+    """LanguageTool не инициализирован; исключения lru_cache не кэширует."""
+
+    def __init__(self, filtered_text: str):
+        super().__init__("LanguageTool not initialized")
+        self.filtered_text = filtered_text
+
+
+@lru_cache(maxsize=PROCESS_TEXT_CACHE_SIZE)
+def _process_text_cached(
+    text: str
+) -> Tuple[str, Tuple[_CachedIssue, ...], Optional[str], Tuple[str, ...]]:
     """
-    Выполняет базовую логику проверки текста:
-      1. Фильтрация «плохих» слов (BAD_WORDS), заменяя их на '***'.
-      2. Запуск LanguageTool (если доступен)
-      3. (Опционально) автокоррекция (если AUTO_CORRECT=True).
-    Возвращает dict с полями:
-      original_text, filtered_text, found_issues, corrected_text, warnings
+    Кэшируемое ядро process_text. Возвращает только неизменяемые значения:
+      (filtered_text, found_issues, corrected_text, warnings)
     """
     filtered_text = text
     warnings = []
 
-    for bw in BAD_WORDS:
-        pattern = re.compile(rf"\b{bw}\b", re.IGNORECASE)
-        filtered_text = pattern.sub("***", filtered_text)
+    filtered_text = _mask_bad_words(filtered_text)
 
+    tool = _get_tool()
     if tool is None:
-        return {
-            "original_text": text,
-            "filtered_text": filtered_text,
-            "found_issues": [],
-            "corrected_text": None,
-            "warnings": ["LanguageTool not initialized"]
-        }
+        raise _LanguageToolUnavailable(filtered_text)
 
     matches = tool.check(filtered_text)
-    found_issues = []
-    for match in matches:
-        found_issues.append({
-            "offset": match.offset,
-            "error_text": match.matchedText,
-            "suggestions": match.replacements
-        })
+    found_issues = tuple(
+        (match.offset, match.matchedText, tuple(match.replacements))
+        for match in matches
+    )
 
     corrected_text = None
     if AUTO_CORRECT:
@@ -162,16 +229,65 @@ def process_text(text: str) -> Dict[str, Any]:
             logger.warning("Автокоррекция не удалась: %s", ex)
             warnings.append(f"Auto-correct failed: {ex}")
 
+    return filtered_text, found_issues, corrected_text, tuple(warnings)
+
+
+def process_text(text: str) -> Dict[str, Any]:
+    """
+    Выполняет базовую логику проверки текста:
+      1. Фильтрация «плохих» слов (BAD_WORDS), заменяя их на '***'.
+      2. Запуск LanguageTool (если доступен)
+      3. (Опционально) автокоррекция (если AUTO_CORRECT=True).
+    Результаты кэшируются (_process_text_cached), каждый вызов получает свежие списки.
+    Возвращает dict с полями:
+      original_text, filtered_text, found_issues, corrected_text, warnings
+    """
+    # Пустой текст проверять нечего — не ходим в LanguageTool
+    if not text or text.isspace():
+        return {
+            "original_text": text,
+            "filtered_text": text,
+            "found_issues": [],
+            "corrected_text": None,
+            "warnings": []
+        }
+
+    try:
+        filtered_text, issues, corrected_text, warnings = _process_text_cached(
+            text)
+    except _LanguageToolUnavailable as e:
+        return {
+            "original_text": text,
+            "filtered_text": e.filtered_text,
+            "found_issues": [],
+            "corrected_text": None,
+            "warnings": ["LanguageTool not initialized"]
+        }
+
     return {
         "original_text": text,
         "filtered_text": filtered_text,
-        "found_issues": found_issues,
+        "found_issues": [
+            {"offset": offset, "error_text": error_text,
+                "suggestions": list(suggestions)}
+            for offset, error_text, suggestions in issues
+        ],
         "corrected_text": corrected_text,
-        "warnings": warnings
+        "warnings": list(warnings)
     }
 
 # ------------------------- ЭНДПОИНТЫ -------------------------
 
+# Ответы /health и /info не меняются после старта: сериализуем их один раз,
+# чтобы liveness-пробы не собирали dict и не кодировали JSON на каждый вызов.
+_HEALTH_BLOB = orjson.dumps({"status": "OK", "service": "qa_service"})
+_INFO_BLOB = orjson.dumps({
+    "service_name": "qa_service",
+    "language_code": LANGUAGE_CODE,
+    "auto_correct_enabled": AUTO_CORRECT,
+    "bad_words_count": len(BAD_WORDS)
+})
+
 
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -179,8 +295,9 @@ def health_check():
     Простая проверка «живости» сервиса.
     Возвращает JSON: {"status": "OK", "service": "qa_service"}
     """
-    logger.debug("Health-check called.")
-    return jsonify({"status": "OK", "service": "qa_service"}), 200
+    if _DEBUG:
+        logger.debug("Health-check called.")
+    return Response(_HEALTH_BLOB, status=200, mimetype="application/json")
 
 
 @app.route("/info", methods=["GET"])
@@ -189,14 +306,9 @@ def info():
     Возвращает базовую информацию о сервисе
     (название, язык, автокоррекция, кол-во «плохих» слов).
     """
-    info_data = {
-        "service_name": "qa_service",
-        "language_code": LANGUAGE_CODE,
-        "auto_correct_enabled": AUTO_CORRECT,
-        "bad_words_count": len(BAD_WORDS)
-    }
-    logger.debug("Info called. Returning: %s", info_data)
-    return jsonify(info_data), 200
+    if _DEBUG:
+        logger.debug("Info called. Returning: %s", _INFO_BLOB)
+    return Response(_INFO_BLOB, status=200, mimetype="application/json")
 
 # ------------------------- НОВЫЙ ПОДХОД: use_manager vs. старый -------------------------
 
@@ -251,6 +363,9 @@ def info():
                 }
             }
         },
+        413: {
+            "description": "Текст длиннее QA_SERVICE_MAX_TEXT_LEN"
+        },
         500: {
             "description": "В случае ошибки"
         }
@@ -261,7 +376,7 @@ def check_text():
     Выполняет QA-проверку текста, двумя путями:
 
      * use_manager=False (по умолчанию):
-       - Старый подход: process_text + создание QACheck (status=PENDING -> COMPLETED)
+       - Старый подход: process_text + одна запись QACheck (status=COMPLETED/FAILED)
      * use_manager=True:
        - Новый подход: qa_manager.perform_qa_check с расширенными параметрами
 
@@ -274,27 +389,39 @@ def check_text():
     input_text = data.get("text", "")
     use_manager = bool(data.get("use_manager", False))
 
+    # Слишком большой текст надолго занял бы воркер и LanguageTool
+    if len(input_text) > MAX_TEXT_LEN:
+        return jsonify({
+            "status": "error",
+            "message": f"Text too long: {len(input_text)} > {MAX_TEXT_LEN} characters"
+        }), 413
+
     db_session = next(get_db_session())
 
     if not use_manager:
         # === СТАРЫЙ ПУТЬ ===
-        qa_check = create_qa_check(
-            db=db_session,
-            original_text=input_text,
-            filtered_text="",
-            found_issues=[],
-            corrected_text=None,
-            warnings=[],
-            status=QACheckStatus.PENDING
-        )
-        logger.debug("Created QACheck ID=%d (old path)", qa_check.id)
-
+        # Сначала считаем результат, затем пишем одну строку сразу в финальном
+        # статусе (COMPLETED/FAILED): один INSERT вместо INSERT(PENDING) + UPDATE.
         try:
-            result = process_text(input_text)
-
-            update_qa_check_fields(
+            try:
+                result = process_text(input_text)
+            except Exception as e:
+                logger.exception("Ошибка при /check-text (old path): %s", e)
+                qa_check = create_qa_check(
+                    db=db_session,
+                    original_text=input_text,
+                    filtered_text="",
+                    warnings=[str(e)],
+                    status=QACheckStatus.FAILED
+                )
+                if _DEBUG:
+                    logger.debug(
+                        "Created QACheck ID=%d (old path) => FAILED", qa_check.id)
+                return jsonify({"status": "error", "message": str(e)}), 500
+
+            qa_check = create_qa_check(
                 db=db_session,
-                check_id=qa_check.id,
+                original_text=input_text,
                 filtered_text=result["filtered_text"],
                 found_issues=result["found_issues"],
                 corrected_text=result["corrected_text"],
@@ -305,16 +432,6 @@ def check_text():
                 "Old path check-text done, QACheck ID=%d => COMPLETED", qa_check.id)
             return jsonify({"status": "ok", **result}), 200
 
-        except Exception as e:
-            logger.exception("Ошибка при /check-text (old path): %s", e)
-            update_qa_check_fields(
-                db=db_session,
-                check_id=qa_check.id,
-                warnings=(qa_check.warnings or []) + [str(e)],
-                status=QACheckStatus.FAILED
-            )
-            return jsonify({"status": "error", "message": str(e)}), 500
-
         finally:
             db_session.close()
 
@@ -363,28 +480,46 @@ def check_text():
             db_session.close()
 
 
+# ------------------------- СЕРИАЛИЗАЦИЯ QACheck / QAComment -------------------------
+
+
+def _check_to_dict(ch) -> Dict[str, Any]:
+    """QACheck (или DTO QACheckRead) -> dict для JSON-ответа (общий для списка и деталей)."""
+    return {
+        "id": ch.id,
+        "original_text": ch.original_text,
+        "filtered_text": ch.filtered_text,
+        "found_issues": ch.found_issues,
+        "corrected_text": ch.corrected_text,
+        "warnings": ch.warnings,
+        "status": ch.status,
+        "created_at": ch.created_at.isoformat(),
+        "updated_at": ch.updated_at.isoformat(),
+    }
+
+
+def _comment_to_dict(c) -> Dict[str, Any]:
+    """QAComment -> dict для JSON-ответа."""
+    return {
+        "id": c.id,
+        "comment_text": c.comment_text,
+        "created_at": c.created_at.isoformat(),
+    }
+
+
 @app.route("/qa-checks", methods=["GET"])
 def get_all_qa_checks():
     """
     Возвращает список (limit=50) QACheck.
+    Следующая страница: ?after_id=<id последней записи>.
     """
     db_session = next(get_db_session())
     try:
-        checks = list_qa_checks(db_session, limit=50, offset=0)
-        result = []
-        for ch in checks:
-            result.append({
-                "id": ch.id,
-                "original_text": ch.original_text,
-                "filtered_text": ch.filtered_text,
-                "found_issues": ch.found_issues,
-                "corrected_text": ch.corrected_text,
-                "warnings": ch.warnings,
-                "status": ch.status.value,
-                "created_at": str(ch.created_at),
-                "updated_at": str(ch.updated_at),
-            })
-        logger.debug("Fetched %d QA checks.", len(result))
+        after_id = request.args.get("after_id", type=int)
+        checks = list_qa_checks(db_session, limit=50, after_id=after_id)
+        result = [_check_to_dict(ch) for ch in checks]
+        if _DEBUG:
+            logger.debug("Fetched %d QA checks.", len(result))
         return jsonify(result), 200
     except Exception as e:
         logger.exception("Ошибка при get_all_qa_checks: %s", e)
@@ -400,32 +535,17 @@ def get_qa_check_details(check_id: int):
     """
     db_session = next(get_db_session())
     try:
-        check_obj = get_qa_check_by_id(db_session, check_id)
+        check_obj = get_qa_check_dto(db_session, check_id)
         if not check_obj:
             logger.warning("QACheck not found, ID=%d", check_id)
             return jsonify({"status": "error", "message": "Not found"}), 404
 
         comments = list_comments_for_check(db_session, check_id)
-        response = {
-            "id": check_obj.id,
-            "original_text": check_obj.original_text,
-            "filtered_text": check_obj.filtered_text,
-            "found_issues": check_obj.found_issues,
-            "corrected_text": check_obj.corrected_text,
-            "warnings": check_obj.warnings,
-            "status": check_obj.status.value,
-            "created_at": str(check_obj.created_at),
-            "updated_at": str(check_obj.updated_at),
-            "comments": [
-                {
-                    "id": c.id,
-                    "comment_text": c.comment_text,
-                    "created_at": str(c.created_at)
-                } for c in comments
-            ]
-        }
-        logger.debug("Detail QACheck, ID=%d => found %d comments",
-                     check_id, len(comments))
+        response = _check_to_dict(check_obj)
+        response["comments"] = [_comment_to_dict(c) for c in comments]
+        if _DEBUG:
+            logger.debug("Detail QACheck, ID=%d => found %d comments",
+                         check_id, len(comments))
         return jsonify(response), 200
     except Exception as e:
         logger.exception("Ошибка при get_qa_check_details: %s", e)
@@ -457,13 +577,10 @@ def add_comment_to_check(check_id: int):
                 "Failed to create comment for QACheck ID=%d", check_id)
             return jsonify({"status": "error", "message": "Create comment failed"}), 500
 
-        resp = {
-            "id": comment.id,
-            "comment_text": comment.comment_text,
-            "created_at": str(comment.created_at),
-        }
-        logger.debug(
-            "Created comment for QACheck ID=%d => comment_id=%d", check_id, comment.id)
+        resp = _comment_to_dict(comment)
+        if _DEBUG:
+            logger.debug(
+                "Created comment for QACheck ID=%d => comment_id=%d", check_id, comment.id)
         return jsonify(resp), 200
 
     except Exception as e:
@@ -486,6 +603,7 @@ def handle_exception(e):
 
 
 # ------------------------- ЗАПУСК FLASK -------------------------
+# Только для локальной отладки. В продакшене: gunicorn -c gunicorn.conf.py wsgi:app
 if __name__ == "__main__":
     logger.info(
         "Starting QA Service on port=%d, debug=%s, auto_correct=%s, lang=%s, DB=%s",
@@ -5,7 +5,7 @@ qa_service/config/logging_config.py
 - dictConfig
 - Параметры из Pydantic (LOG_LEVEL, ENABLE_JSON_LOGS, LOG_FILE и др.)
 - JSON-логгер (python-json-logger) при необходимости
-- RotatingFileHandler (с ротацией)
+- RotatingFileHandler (с ротацией), запись в файл — в фоновом потоке (QueueListener)
 - Возможность цветного лога в консоли (colorlog) при желании
 - Раздельные уровни логирования для консоли/файла
 
@@ -19,11 +19,14 @@ qa_service/config/logging_config.py
     logger.info("Пример лога")
 """
 
+import atexit
 import logging
 import logging.config
-import os
+import logging.handlers
+import queue
+from functools import lru_cache
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from config.settings import get_settings
 
@@ -40,6 +43,14 @@ except ImportError:
     COLORLOG_AVAILABLE = False
 
 
+# setup_logging() применяет dictConfig только один раз на процесс
+_configured = False
+
+# Фоновый поток, пишущий записи в файл (см. _move_file_handler_to_queue)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@lru_cache(maxsize=1)
 def get_logging_config_dict() -> Dict[str, Any]:
     """
     Формирует dictConfig для logging, учитывая настройки из Pydantic:
@@ -53,6 +64,7 @@ def get_logging_config_dict() -> Dict[str, Any]:
     - DISABLE_EXISTING_LOGGERS (bool; True/False)
 
     Возвращает словарь, который можно передать в logging.config.dictConfig().
+    Словарь строится один раз и кэшируется (общий объект — не изменяйте его).
     """
 
     settings = get_settings()
@@ -61,13 +73,12 @@ def get_logging_config_dict() -> Dict[str, Any]:
     log_level = settings.LOG_LEVEL.upper()                 # уровень для root
     enable_json_logs = settings.ENABLE_JSON_LOGS
     log_file = settings.LOG_FILE or ""                     # путь к файлу
-    # Дополнительные (можно задать в settings.py, а при отсутствии — fallback):
-    log_console_level = os.getenv("LOG_CONSOLE_LEVEL", log_level).upper()
-    log_file_level = os.getenv("LOG_FILE_LEVEL", log_level).upper()
-    log_max_bytes = int(os.getenv("LOG_MAX_BYTES", "5242880"))  # 5 MB
-    log_backup_count = int(os.getenv("LOG_BACKUP_COUNT", "3"))
-    disable_existing_loggers = os.getenv(
-        "DISABLE_EXISTING_LOGGERS", "false").lower() == "true"
+    # Дополнительные (задаются в settings.py, а при отсутствии — fallback на LOG_LEVEL):
+    log_console_level = (settings.LOG_CONSOLE_LEVEL or log_level).upper()
+    log_file_level = (settings.LOG_FILE_LEVEL or log_level).upper()
+    log_max_bytes = settings.LOG_MAX_BYTES
+    log_backup_count = settings.LOG_BACKUP_COUNT
+    disable_existing_loggers = settings.DISABLE_EXISTING_LOGGERS
 
     # Базовые форматы
     default_format = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
@@ -168,13 +179,47 @@ def get_logging_config_dict() -> Dict[str, Any]:
     return logging_config
 
 
+def _move_file_handler_to_queue() -> None:
+    """
+    Заменяет файловый handler root-логгера на QueueHandler.
+    Запись на диск и ротацию (rename) выполняет QueueListener в отдельном
+    потоке, поэтому logger.info() в обработчике запроса не ждёт файловый I/O.
+    """
+    global _queue_listener
+    root = logging.getLogger()
+    file_handler = next(
+        (h for h in root.handlers if h.get_name() == "file"), None)
+    if file_handler is None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.set_name("file_queue")
+
+    root.removeHandler(file_handler)
+    root.addHandler(queue_handler)
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True)
+    _queue_listener.start()
+    # Дописываем очередь в файл при завершении процесса
+    atexit.register(_queue_listener.stop)
+
+
 def setup_logging() -> None:
     """
     Инициализирует логирование при помощи dictConfig,
-    учитывая настройки из Pydantic (settings.py) и дополнительные переменные окружения.
+    учитывая настройки из Pydantic (settings.py).
+    Идемпотентна: повторные вызовы в том же процессе ничего не делают.
     """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
     config_dict = get_logging_config_dict()
     logging.config.dictConfig(config_dict)
+    _move_file_handler_to_queue()
     logger = logging.getLogger("qa_service")
 
     logger.debug("Logging initialized with dictConfig.")
@@ -186,13 +231,12 @@ def setup_logging() -> None:
                     config_dict["handlers"]["console"]["level"])
     if "file" in config_dict["handlers"]:
         file_cfg = config_dict["handlers"]["file"]
-        logger.info("File logging -> %s (level=%s)",
+        logger.info("File logging -> %s (level=%s, via QueueListener)",
                     file_cfg["filename"], file_cfg["level"])
     else:
         logger.info("File logging is disabled (LOG_FILE not set or empty).")
 
     # JSON logging
-    from config.settings import get_settings
     s = get_settings()
     if JSON_LOGGING_AVAILABLE and s.ENABLE_JSON_LOGS:
         logger.info("JSON logging is enabled.")
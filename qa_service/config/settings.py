@@ -9,19 +9,10 @@ qa_service/config/settings.py
 с раздельными уровнями логирования для консоли и файла.
 """
 
-import os
-from typing import List, Optional
-
-try:
-    # Если хотите подхватывать локальный .env при разработке,
-    # а не только переменные окружения из системы/docker,
-    # подключите это:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from typing import Optional, Tuple
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -56,6 +47,47 @@ class Settings(BaseSettings):
         description="Включать ли автоматическую коррекцию текста?"
     )
 
+    # Ограничение на размер входного текста (символов), больше — 413
+    QA_SERVICE_MAX_TEXT_LEN: int = Field(
+        100000,
+        description="Макс. длина текста для /check-text (в символах)"
+    )
+    # Ограничение на размер тела запроса (байт), больше — 413 ещё до разбора JSON
+    QA_SERVICE_MAX_BODY_BYTES: int = Field(
+        1 << 20,
+        description="Макс. размер тела HTTP-запроса (в байтах, Flask MAX_CONTENT_LENGTH)"
+    )
+
+    # =====================
+    # LanguageTool-сервер
+    # =====================
+    QA_LT_REMOTE_URL: Optional[str] = Field(
+        None,
+        description="URL отдельного LanguageTool-сервера (например, http://languagetool:8010). "
+                    "Если не задан, каждый процесс поднимает собственную JVM."
+    )
+    QA_LT_POOL_MAXSIZE: int = Field(
+        100,
+        description="Макс. число keep-alive соединений к LanguageTool-серверу на процесс "
+                    "(одновременных проверок в gevent-воркере)"
+    )
+
+    # =====================
+    # Продакшен-сервер (gunicorn + gevent, см. gunicorn.conf.py)
+    # =====================
+    QA_SERVICE_WORKERS: int = Field(
+        4,
+        description="Число worker-процессов gunicorn"
+    )
+    QA_SERVICE_WORKER_CLASS: str = Field(
+        "gevent",
+        description="Класс worker'а gunicorn (gevent, sync, gthread и т.д.)"
+    )
+    QA_SERVICE_WORKER_CONNECTIONS: int = Field(
+        200,
+        description="Макс. число одновременных соединений на один gevent-worker"
+    )
+
     # =====================
     # Логирование (базовые)
     # =====================
@@ -75,11 +107,11 @@ class Settings(BaseSettings):
     # =====================
     # Логирование (расширенные опции)
     # =====================
-    LOG_CONSOLE_LEVEL: str = Field(
+    LOG_CONSOLE_LEVEL: Optional[str] = Field(
         None,
         description="Уровень логирования для консоли (если не указан, используется LOG_LEVEL)."
     )
-    LOG_FILE_LEVEL: str = Field(
+    LOG_FILE_LEVEL: Optional[str] = Field(
         None,
         description="Уровень логирования для файла (если не указан, используется LOG_LEVEL)."
     )
@@ -112,42 +144,51 @@ class Settings(BaseSettings):
     # =====================
     # Свойство для разбивки QA_SERVICE_BAD_WORDS
     # =====================
-    @property
-    def bad_words_list(self) -> List[str]:
+    @cached_property
+    def bad_words_list(self) -> Tuple[str, ...]:
         """
-        Удобное свойство, возвращающее список "запрещённых слов",
-        разбитый по ';' и «очищенный» от пустых значений.
+        Удобное свойство, возвращающее "запрещённые слова",
+        разбитые по ';' и «очищенные» от пустых значений.
+        Вычисляется один раз; кортеж неизменяемый, копировать его не нужно.
         """
         raw = self.QA_SERVICE_BAD_WORDS.strip()
         if not raw:
-            return []
-        return [w.strip() for w in raw.split(";") if w.strip()]
-
-    class Config:
-        # Pydantic будет автоматически подхватывать переменные окружения,
-        # соответствующие именам полей (QA_SERVICE_PORT, QA_SERVICE_DEBUG и т.д.).
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        # Если хотите использовать .env по умолчанию (без явного load_dotenv),
-        # раскомментируйте строку ниже (и убедитесь, что .env лежит рядом):
-        # env_file = ".env"
+            return ()
+        return tuple(w.strip() for w in raw.split(";") if w.strip())
+
+    # Pydantic будет автоматически подхватывать переменные окружения,
+    # соответствующие именам полей (QA_SERVICE_PORT, QA_SERVICE_DEBUG и т.д.),
+    # а при локальной разработке — и из .env (переменные окружения важнее).
+    # frozen=True: настройки неизменяемы и безопасно разделяются между потоками.
+    # defer_build=True: схема pydantic-core строится при первом Settings(),
+    # а не при определении класса (импорт модуля сам по себе дешевле).
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        frozen=True,
+        extra="ignore",
+        defer_build=True,
+    )
 
 
 # ------------------------------------------------------------------------------
 # Синглтон-функция, чтобы не создавать Settings() многократно
 # ------------------------------------------------------------------------------
-_settings_instance: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Возвращает глобальный объект настроек (синглтон), чтобы
     не создавать объект Settings при каждом обращении.
+    Перечитать окружение (например, в тестах): get_settings.cache_clear().
     """
-    global _settings_instance
-    if _settings_instance is None:
-        _settings_instance = Settings()
-    return _settings_instance
+    return Settings()
+
+
+# Валидируем окружение сразу при импорте: некорректная конфигурация роняет
+# процесс на старте (в мастере gunicorn — до fork воркеров), а не на первом
+# запросе. Результат остаётся в кэше get_settings().
+get_settings()
 
 
 # ------------------------------------------------------------------------------
@@ -160,6 +201,13 @@ if __name__ == "__main__":
     print("LANGUAGE:", settings.QA_SERVICE_LANG)
     print("BAD_WORDS:", settings.bad_words_list)
     print("AUTO_CORRECT:", settings.QA_SERVICE_AUTO_CORRECT)
+    print("MAX_TEXT_LEN:", settings.QA_SERVICE_MAX_TEXT_LEN)
+    print("MAX_BODY_BYTES:", settings.QA_SERVICE_MAX_BODY_BYTES)
+    print("LT_REMOTE_URL:", settings.QA_LT_REMOTE_URL)
+    print("LT_POOL_MAXSIZE:", settings.QA_LT_POOL_MAXSIZE)
+    print("WORKERS:", settings.QA_SERVICE_WORKERS)
+    print("WORKER_CLASS:", settings.QA_SERVICE_WORKER_CLASS)
+    print("WORKER_CONNECTIONS:", settings.QA_SERVICE_WORKER_CONNECTIONS)
     print("LOG_LEVEL:", settings.LOG_LEVEL)
     print("ENABLE_JSON_LOGS:", settings.ENABLE_JSON_LOGS)
     print("LOG_FILE:", settings.LOG_FILE)
@@ -170,4 +218,4 @@ if __name__ == "__main__":
     print("DISABLE_EXISTING_LOGGERS:", settings.DISABLE_EXISTING_LOGGERS)
     print("DATABASE_URL:", settings.DATABASE_URL)
     print("MAIN_INTERVAL:", settings.MAIN_INTERVAL)
-    print("All settings:", settings.dict())
+    print("All settings:", settings.model_dump())
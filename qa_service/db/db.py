@@ -4,8 +4,9 @@ qa_service/db/db.py
 Инициализация подключения к базе данных (SQLAlchemy) для QA-сервиса.
 
 Функциональность:
-- engine: движок SQLAlchemy (основываясь на DATABASE_URL из Pydantic-настроек).
-- SessionLocal: фабрика сессий (sessionmaker).
+- get_engine(): движок SQLAlchemy (основываясь на DATABASE_URL из Pydantic-настроек),
+  создаётся лениво при первом обращении.
+- _get_sessionmaker(): фабрика сессий (sessionmaker), тоже ленивая.
 - get_session(): возвращает новую сессию (не забудьте закрывать её).
 - session_scope(): контекстный менеджер (with ...) для автоматического commit/rollback.
 - init_db(): опциональная функция для создания таблиц напрямую (Base.metadata.create_all),
@@ -18,12 +19,14 @@ qa_service/db/db.py
 """
 
 import logging
-from typing import Optional
+from functools import lru_cache
 from typing import Generator
 
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -33,45 +36,87 @@ from db.models import Base  # Нужно, если используем init_db(
 logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------------------------
-# Считываем настройки
+# Параметры пула
 # ------------------------------------------------------------------------------
-settings = get_settings()
-DATABASE_URL = settings.DATABASE_URL
-
 # Ниже - пример, если хотите доп. параметры (pool_size и т.д.)
 # Если нет нужды, можно удалить или закомментировать.
-DB_POOL_SIZE = 5
+# gevent-воркер обслуживает сотни запросов сразу, поэтому постоянных соединений
+# больше, чем по умолчанию; при 4 воркерах (QA_SERVICE_WORKERS) пик —
+# 4 * (10 + 10) = 80, в пределах max_connections=100 PostgreSQL по умолчанию.
+DB_POOL_SIZE = 10
 DB_MAX_OVERFLOW = 10
 DB_POOL_TIMEOUT = 30
+# Соединения старше DB_POOL_RECYCLE секунд переоткрываются: облачный PostgreSQL
+# и PgBouncer закрывают простаивающие соединения раньше, чем о них узнаёт пул.
+DB_POOL_RECYCLE = 1800
 # Например, можете прочитать из окружения/настроек:
 # DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
 # DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
 # DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
 
 # ------------------------------------------------------------------------------
-# Создаём движок
+# Движок и фабрика сессий (ленивые)
 # ------------------------------------------------------------------------------
-# Параметр future=True включает поведение SQLAlchemy 2.0 (рекомендуется)
-# echo=False - скрыть SQL-запросы (если нужно отладить - echo=True).
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    future=True,
-    pool_size=DB_POOL_SIZE,
-    max_overflow=DB_MAX_OVERFLOW,
-    pool_timeout=DB_POOL_TIMEOUT,
-    # pool_recycle=1800,  # при необходимости
-)
+# Создаются при первом обращении, а не при импорте: импорт db.py/repository.py
+# не требует DATABASE_URL, а процесс, не работающий с БД, не открывает пул.
+
+
+def _json_serializer(value) -> str:
+    """
+    Сериализация JSONB-колонок (found_issues, warnings) через orjson.
+    datetime/UUID orjson понимает сам; прочее (Decimal и т.п.) — через str().
+    """
+    return orjson.dumps(value, default=str).decode()
 
-# ------------------------------------------------------------------------------
-# Настраиваем фабрику сессий
-# ------------------------------------------------------------------------------
-SessionLocal = sessionmaker(
-    bind=engine,
-    autocommit=False,
-    autoflush=False,
-    future=True
-)
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Возвращает движок SQLAlchemy (один на процесс), создавая его при первом вызове.
+    Бросает RuntimeError, если DATABASE_URL не задан.
+    """
+    database_url = get_settings().DATABASE_URL
+    if not database_url:
+        raise RuntimeError(
+            "DATABASE_URL не задан: укажите его в окружении или .env")
+
+    # Параметр future=True включает поведение SQLAlchemy 2.0 (рекомендуется)
+    # echo=False - скрыть SQL-запросы (если нужно отладить - echo=True).
+    return create_engine(
+        database_url,
+        echo=False,
+        future=True,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        # SELECT 1 при выдаче соединения из пула: «мёртвое» соединение
+        # тихо заменяется новым, а не падает OperationalError на первом запросе.
+        pool_pre_ping=True,
+        # LIFO: выдаётся последнее возвращённое («горячее») соединение, а
+        # лишние простаивают и закрываются по pool_recycle / таймауту сервера,
+        # а не прокручиваются по кругу (FIFO) и не держатся открытыми все сразу.
+        pool_use_lifo=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_sessionmaker() -> sessionmaker:
+    """
+    Фабрика сессий, привязанная к get_engine().
+    expire_on_commit=False: после commit объекты сохраняют значения, полученные
+    через RETURNING, и чтение их атрибутов не вызывает повторный SELECT.
+    Сессии живут в пределах одного запроса, так что устаревание не страшно.
+    """
+    return sessionmaker(
+        bind=get_engine(),
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        future=True
+    )
 
 # ------------------------------------------------------------------------------
 # Функции для работы с сессиями
@@ -91,7 +136,7 @@ def get_session() -> Session:
 
     Или используйте session_scope() для автоматического управления.
     """
-    return SessionLocal()
+    return _get_sessionmaker()()
 
 
 @contextmanager
@@ -111,9 +156,9 @@ def session_scope() -> Generator[Session, None, None]:
     try:
         yield session
         session.commit()
-    except Exception as e:
+    except Exception:
+        # Не логируем: исключение уходит выше, и его логирует обработчик
         session.rollback()
-        logger.exception("session_scope() rollback due to exception: %s", e)
         raise
     finally:
         session.close()
@@ -126,12 +171,12 @@ def session_scope() -> Generator[Session, None, None]:
 def init_db() -> None:
     """
     Опциональная функция для локальной разработки или тестов,
-    создаёт все таблицы (Base.metadata.create_all(bind=engine)).
+    создаёт все таблицы (Base.metadata.create_all(bind=get_engine())).
 
     В продакшене при использовании Alembic полагайтесь на миграции!
     """
     logger.info("Initializing database schema... (create_all)")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     logger.info("Database schema initialized.")
 
 # ------------------------------------------------------------------------------
@@ -139,14 +184,19 @@ def init_db() -> None:
 # ------------------------------------------------------------------------------
 
 
+# В SQLAlchemy 2.0 сырая строка не исполняется (ObjectNotExecutableError),
+# нужен text(); объект запроса создаём один раз.
+_PING = text("SELECT 1")
+
+
 def health_check_db() -> bool:
     """
     Простой тест доступности БД (SELECT 1).
     Возвращает True при успехе, иначе False.
     """
     try:
-        with engine.connect() as connection:
-            connection.execute("SELECT 1;")
+        with get_engine().connect() as connection:
+            connection.execute(_PING)
         return True
     except SQLAlchemyError as e:
         logger.error("Database health check failed: %s", e)
@@ -10,8 +10,8 @@ SQLAlchemy-модели (ORM) для хранения данных микрос
 
 Использует:
   - SQLAlchemy
-  - sqlalchemy.ext.mutable (MutableList/MutableDict) + PostgreSQL JSONB
-  - Enum (для статусов)
+  - PostgreSQL JSONB (списки присваиваются целиком, без MutableList)
+  - String + CHECK (для статусов, значения из QACheckStatus)
   - created_at/updated_at для временных меток
 
 Для создания таблиц (в локальной разработке) можно вызвать db.init_db(), но в продакшене 
@@ -28,13 +28,14 @@ from sqlalchemy import (
     String,
     Text,
     DateTime,
-    Enum,
     ForeignKey,
+    Index,
+    CheckConstraint,
     func
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.mutable import MutableList, MutableDict
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 Base = declarative_base()
@@ -67,11 +68,22 @@ class QACheck(Base):
       - found_issues: JSONB (список найденных проблем, [{offset, error_text, suggestions}, ...])
       - corrected_text: автокорректированный текст (если применялась автокоррекция)
       - warnings: JSONB (список строк/сообщений, например ["Error GPT", "Auto-correct failed: ..."])
-      - status: Enum(QACheckStatus) – текущее состояние
+      - status: строка-значение QACheckStatus (CHECK-ограничение) – текущее состояние
       - created_at, updated_at: временные метки
     """
 
     __tablename__ = "qa_checks"
+    __table_args__ = (
+        # find_by_status: WHERE status = ... ORDER BY id DESC (index-only scan)
+        Index("ix_qa_checks_status_id", "status", "id"),
+        # mass_delete_old_checks: WHERE updated_at < cutoff
+        Index("ix_qa_checks_updated_at", "updated_at"),
+        CheckConstraint(
+            "status IN ({})".format(
+                ", ".join(f"'{st.value}'" for st in QACheckStatus)),
+            name="ck_qa_checks_status",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     original_text = Column(Text, nullable=False,
@@ -79,23 +91,29 @@ class QACheck(Base):
     filtered_text = Column(Text, nullable=False,
                            doc="Текст после фильтрации запрещённых слов")
 
-    # JSONB для списка проблем (issues). Оборачиваем в MutableList,
-    # чтобы SQLAlchemy автоматически отслеживал изменения (добавление/удаление).
-    found_issues = Column(MutableList.as_mutable(
-        JSONB), nullable=True, doc="Список найденных ошибок/проблем")
+    # JSONB для списка проблем (issues). Без MutableList: список всегда
+    # присваивается целиком (qa_check.found_issues = [...]), а отслеживание
+    # изменений по элементам лишь добавляло обёртку к каждой загруженной строке.
+    # Не изменяйте список на месте (append) — такое изменение не сохранится.
+    found_issues = Column(JSONB, nullable=True,
+                          doc="Список найденных ошибок/проблем")
 
     corrected_text = Column(Text, nullable=True,
                             doc="Текст после автокоррекции (если применялась)")
 
     # warnings – тоже JSONB (список/массив). Например ["Auto-correct failed: ...", ...]
-    warnings = Column(MutableList.as_mutable(JSONB),
-                      nullable=True, doc="Список предупреждений/логов")
+    # Как и found_issues, только целиком: qa_check.warnings = qa_check.warnings + [...]
+    warnings = Column(JSONB, nullable=True, doc="Список предупреждений/логов")
 
+    # Статус хранится строкой (значение QACheckStatus: "pending", "completed"...),
+    # без Enum-типа SQLAlchemy: строки читаются без преобразования в Enum на
+    # каждую запись. Допустимые значения проверяет CHECK-ограничение (см.
+    # __table_args__), Enum при необходимости — через status_enum.
     status = Column(
-        Enum(QACheckStatus, native_enum=False),
-        default=QACheckStatus.PENDING,
+        String(16),
+        default=QACheckStatus.PENDING.value,
         nullable=False,
-        doc="Статус проверки (Enum)"
+        doc="Статус проверки (значение QACheckStatus)"
     )
 
     created_at = Column(
@@ -119,8 +137,17 @@ class QACheck(Base):
         cascade="all, delete-orphan",
     )
 
+    @hybrid_property
+    def status_enum(self) -> QACheckStatus:
+        """Статус в виде QACheckStatus (для кода, которому нужен Enum)."""
+        return QACheckStatus(self.status)
+
+    @status_enum.setter
+    def status_enum(self, value: QACheckStatus) -> None:
+        self.status = value.value
+
     def __repr__(self) -> str:
-        return (f"<QACheck id={self.id}, status={self.status.value}, "
+        return (f"<QACheck id={self.id}, status={self.status}, "
                 f"created_at={self.created_at}, updated_at={self.updated_at}>")
 
 
@@ -142,6 +169,10 @@ class QAComment(Base):
     """
 
     __tablename__ = "qa_comments"
+    __table_args__ = (
+        # list_comments_for_check: WHERE qa_check_id = ... ORDER BY id DESC
+        Index("ix_qa_comments_check_id_id", "qa_check_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     qa_check_id = Column(Integer, ForeignKey(
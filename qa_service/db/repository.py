@@ -5,12 +5,23 @@ qa_service/db/repository.py
 
 Основные методы:
  - create_qa_check, get_qa_check_by_id, update_qa_check, delete_qa_check...
+ - create_qa_checks_bulk (массовая вставка одним INSERT ... RETURNING)
+ - get_qa_check_dto (чтение в Pydantic-DTO QACheckRead, см. db/schemas.py)
+ - get_qa_check_with_comments (проверка вместе с комментариями одним запросом)
  - create_qa_comment, list_comments_for_check, delete_qa_comment...
- - list_qa_checks (с фильтрами, пагинацией)
+ - count_comments_for_checks (число комментариев для списка проверок)
+ - list_qa_checks (с фильтрами, пагинацией; keyset через after_id;
+   with_comments — предзагрузка комментариев через selectinload)
+ - iter_qa_checks (то же, потоково: серверный курсор + yield_per)
+ - list_qa_check_rows (то же, но словарями через Core, без ORM-объектов)
  - Примеры расширенных сценариев: find_by_status, mass_delete_old_checks...
 
 Все операции принимают SQLAlchemy Session (db: Session), 
 которую можно получать через get_session() или session_scope() из db.py.
+Поиск по первичному ключу идёт через Session.get(): объект, уже загруженный
+в эту сессию, берётся из identity map без повторного SELECT.
+Ошибки SQLAlchemy обрабатывает декоратор @db_operation (rollback + лог +
+значение по умолчанию: None / False / [] / 0).
 
 Пример использования:
     from db.db import get_session
@@ -21,23 +32,65 @@ qa_service/db/repository.py
         ...
 """
 
+import functools
 import logging
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, delete, insert, lambda_stmt, select, update
 
 from db.models import QACheck, QACheckStatus, QAComment
+from db.schemas import QACheckRead
 
 logger = logging.getLogger(__name__)
 
+# ------------------------------------------------------------------------------
+# Единая обработка ошибок БД
+# ------------------------------------------------------------------------------
+
+
+def db_operation(
+    default: Any = None,
+    *,
+    default_factory: Optional[Callable[[], Any]] = None,
+    rollback: bool = True,
+    reraise: bool = False
+):
+    """
+    Декоратор для репозиторных функций (первый аргумент — Session):
+    перехватывает SQLAlchemyError, при rollback=True откатывает транзакцию,
+    логирует ошибку и возвращает default (или default_factory() — для
+    изменяемых значений вроде []). При reraise=True исключение пробрасывается.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(db: Session, *args, **kwargs):
+            try:
+                return fn(db, *args, **kwargs)
+            except SQLAlchemyError as e:
+                if rollback:
+                    db.rollback()
+                logger.exception("Error in %s: %s", fn.__name__, e)
+                if reraise:
+                    raise
+                return default_factory() if default_factory else default
+        return wrapper
+    return decorator
+
+
+def _status_value(status: Union[QACheckStatus, str]) -> str:
+    """QACheckStatus (или строка-значение) -> строка для колонки qa_checks.status."""
+    return QACheckStatus(status).value
+
+
 # ------------------------------------------------------------------------------
 # QACheck CRUD
 # ------------------------------------------------------------------------------
 
 
+@db_operation(reraise=True)
 def create_qa_check(
     db: Session,
     original_text: str,
@@ -65,38 +118,119 @@ def create_qa_check(
     if warnings is None:
         warnings = []
 
-    try:
-        qa_check = QACheck(
-            original_text=original_text,
-            filtered_text=filtered_text,
-            found_issues=found_issues,
-            corrected_text=corrected_text,
-            warnings=warnings,
-            status=status
-        )
-        db.add(qa_check)
-        db.commit()
-        db.refresh(qa_check)
-        logger.debug("Created QACheck id=%s status=%s",
-                     qa_check.id, qa_check.status)
-        return qa_check
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Error creating QACheck: %s", e)
-        raise
-
+    # INSERT ... RETURNING сразу заполняет id/created_at/updated_at,
+    # отдельный SELECT (db.refresh) не нужен
+    stmt = insert(QACheck).values(
+        original_text=original_text,
+        filtered_text=filtered_text,
+        found_issues=found_issues,
+        corrected_text=corrected_text,
+        warnings=warnings,
+        status=_status_value(status)
+    ).returning(QACheck)
+    qa_check = db.scalars(stmt).one()
+    db.commit()
+    logger.debug("Created QACheck id=%s status=%s",
+                 qa_check.id, qa_check.status)
+    return qa_check
+
+
+@db_operation(default_factory=list)
+def create_qa_checks_bulk(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    comments: Optional[List[Optional[str]]] = None
+) -> List[int]:
+    """
+    Массовое создание QACheck одним INSERT ... RETURNING id (executemany,
+    SQLAlchemy «insertmanyvalues»): один запрос на пачку вместо
+    отдельного INSERT ... RETURNING + COMMIT на каждую запись, как в create_qa_check.
+
+    :param rows: список dict с полями QACheck (original_text, filtered_text,
+                 found_issues, corrected_text, warnings, status);
+                 пропущенные found_issues/warnings -> [], status -> PENDING
+    :param comments: (опционально) текст QAComment для каждой строки rows
+                 (None — без комментария); комментарии вставляются вторым
+                 INSERT в той же транзакции
+    :return: список id созданных записей (в порядке rows); [] при ошибке
+             (тогда не создаётся ничего)
+    """
+    if not rows:
+        return []
 
+    values = [
+        {
+            "found_issues": [],
+            "warnings": [],
+            "corrected_text": None,
+            **row,
+            "status": _status_value(row.get("status", QACheckStatus.PENDING)),
+        }
+        for row in rows
+    ]
+    ids = list(db.scalars(
+        insert(QACheck).returning(QACheck.id, sort_by_parameter_order=True),
+        values
+    ).all())
+    comment_values = [
+        {"qa_check_id": check_id, "comment_text": text}
+        for check_id, text in zip(ids, comments or ())
+        if text is not None
+    ]
+    if comment_values:
+        db.execute(insert(QAComment), comment_values)
+    db.commit()
+    logger.debug("Bulk-created %d QACheck rows (%d comments)",
+                 len(ids), len(comment_values))
+    return ids
+
+
+@db_operation(rollback=False)
 def get_qa_check_by_id(db: Session, check_id: int) -> Optional[QACheck]:
     """
     Возвращает QACheck по заданному id, либо None, если не найден.
     """
-    try:
-        return db.query(QACheck).filter(QACheck.id == check_id).one_or_none()
-    except SQLAlchemyError as e:
-        logger.exception("Error fetching QACheck by id=%s: %s", check_id, e)
+    return db.get(QACheck, check_id)
+
+
+@db_operation(rollback=False)
+def get_qa_check_with_comments(db: Session, check_id: int) -> Optional[QACheck]:
+    """
+    Возвращает QACheck по id с уже загруженными .comments (новые первыми,
+    как list_comments_for_check), либо None.
+
+    Один SELECT ... LEFT OUTER JOIN qa_comments вместо двух запросов
+    (get_qa_check_by_id + list_comments_for_check). Для одной проверки JOIN
+    дешевле selectinload, которому всё равно нужен второй SELECT.
+    """
+    stmt = lambda_stmt(
+        lambda: select(QACheck)
+        .outerjoin(QACheck.comments)
+        .options(contains_eager(QACheck.comments))
+        .where(QACheck.id == check_id)
+        .order_by(QAComment.id.desc())
+    )
+    return db.execute(stmt).unique().scalar_one_or_none()
+
+
+@db_operation(rollback=False)
+def get_qa_check_dto(db: Session, check_id: int) -> Optional[QACheckRead]:
+    """
+    Возвращает QACheck по id в виде DTO (QACheckRead), либо None.
+
+    Читает колонки таблицы напрямую (без ORM identity map) и собирает DTO через
+    model_construct(): строки из БД — доверенные данные, повторная валидация
+    Pydantic для них не нужна.
+    """
+    row = db.execute(
+        select(*QACheck.__table__.c).where(QACheck.id == check_id)
+    ).one_or_none()
+    if row is None:
         return None
+    return QACheckRead.model_construct(**row._mapping)
 
 
+@db_operation()
 def update_qa_check_fields(
     db: Session,
     check_id: int,
@@ -110,186 +244,312 @@ def update_qa_check_fields(
     Обновляет определённые поля QACheck (выборочно).
     Возвращает обновлённый объект или None, если не найден.
 
+    Выполняется одним UPDATE ... WHERE id = :id RETURNING вместо
+    SELECT + изменение атрибутов + UPDATE.
+
     Пример:
       update_qa_check_fields(db, check_id=123, status=QACheckStatus.COMPLETED)
     """
-    try:
-        qa_check = db.query(QACheck).filter(
-            QACheck.id == check_id).one_or_none()
-        if not qa_check:
-            return None
-
-        if filtered_text is not None:
-            qa_check.filtered_text = filtered_text
-        if found_issues is not None:
-            qa_check.found_issues = found_issues
-        if corrected_text is not None:
-            qa_check.corrected_text = corrected_text
-        if warnings is not None:
-            qa_check.warnings = warnings
-        if status is not None:
-            qa_check.status = status
-
-        db.commit()
-        db.refresh(qa_check)
-        logger.debug("Partially updated QACheck id=%s status=%s",
-                     check_id, qa_check.status)
-        return qa_check
-    except SQLAlchemyError as e:
+    values = {
+        key: value for key, value in (
+            ("filtered_text", filtered_text),
+            ("found_issues", found_issues),
+            ("corrected_text", corrected_text),
+            ("warnings", warnings),
+            ("status", None if status is None else _status_value(status)),
+        ) if value is not None
+    }
+
+    if not values:
+        return db.get(QACheck, check_id)
+
+    stmt = (
+        update(QACheck)
+        .where(QACheck.id == check_id)
+        .values(**values)
+        .returning(QACheck)
+    )
+    qa_check = db.execute(stmt).scalar_one_or_none()
+    if not qa_check:
         db.rollback()
-        logger.exception("Error updating QACheck fields: %s", e)
         return None
 
+    db.commit()
+    logger.debug("Partially updated QACheck id=%s fields=%s",
+                 check_id, list(values))
+    return qa_check
+
 
+@db_operation(default=False)
 def delete_qa_check(db: Session, check_id: int) -> bool:
     """
     Удаляет QACheck по ID. Возвращает True, если запись была успешно удалена, False, если не найдена или ошибка.
     """
-    try:
-        qa_check = db.query(QACheck).filter(
-            QACheck.id == check_id).one_or_none()
-        if not qa_check:
-            return False
-        db.delete(qa_check)
-        db.commit()
-        logger.debug("Deleted QACheck id=%s", check_id)
-        return True
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Error deleting QACheck: %s", e)
+    qa_check = db.get(QACheck, check_id)
+    if not qa_check:
         return False
+    db.delete(qa_check)
+    db.commit()
+    logger.debug("Deleted QACheck id=%s", check_id)
+    return True
 
 
+@db_operation(default_factory=list, rollback=False)
 def list_qa_checks(
     db: Session,
     limit: int = 50,
     offset: int = 0,
     status: Optional[QACheckStatus] = None,
-    order_desc: bool = True
+    order_desc: bool = True,
+    after_id: Optional[int] = None,
+    with_comments: bool = False
 ) -> List[QACheck]:
     """
     Возвращает список QACheck с учётом пагинации limit/offset.
     Можно отфильтровать по статусу. По умолчанию сортируем по id desc.
+
+    Keyset-пагинация: если передан after_id (id последней записи предыдущей
+    страницы), offset игнорируется и выбираются записи «после» неё
+    (id < after_id при desc, id > after_id при asc). В отличие от OFFSET,
+    БД не сканирует пропускаемые строки.
+
+    with_comments=True подгружает QACheck.comments одним дополнительным
+    SELECT ... WHERE qa_check_id IN (...) (selectinload) вместо отдельного
+    запроса на каждую проверку при обращении к .comments. Если нужно лишь
+    число комментариев — см. count_comments_for_checks().
     """
-    try:
-        query = db.query(QACheck)
-        if status:
-            query = query.filter(QACheck.status == status)
-        if order_desc:
-            query = query.order_by(QACheck.id.desc())
-        else:
-            query = query.order_by(QACheck.id.asc())
-
-        return query.limit(limit).offset(offset).all()
-    except SQLAlchemyError as e:
-        logger.exception("Error listing QACheck: %s", e)
-        return []
+    stmt = _list_qa_checks_stmt(limit, offset, status, order_desc, after_id)
+    if with_comments:
+        stmt = stmt.options(selectinload(QACheck.comments))
+    return list(db.scalars(stmt).all())
 
 
+@db_operation(default_factory=list, rollback=False)
+def list_qa_check_rows(
+    db: Session,
+    limit: int = 50,
+    offset: int = 0,
+    status: Optional[QACheckStatus] = None,
+    order_desc: bool = True,
+    after_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    То же, что list_qa_checks (фильтры и пагинация те же), но строки
+    qa_checks возвращаются словарями {колонка: значение}.
+
+    Запрос выбирает колонки таблицы (Core), а не сущность QACheck: строки не
+    превращаются в ORM-объекты и не попадают в identity map сессии. Для
+    списков «только на чтение» (GET /checks) это заметно дешевле.
+    """
+    stmt = _list_qa_checks_stmt(
+        limit, offset, status, order_desc, after_id, entity=QACheck.__table__)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def _list_qa_checks_stmt(
+    limit: int,
+    offset: int,
+    status: Optional[QACheckStatus],
+    order_desc: bool,
+    after_id: Optional[int],
+    entity: Any = QACheck
+):
+    """
+    SELECT для list_qa_checks / iter_qa_checks / list_qa_check_rows
+    (фильтры, порядок, пагинация). entity — QACheck или QACheck.__table__.
+    """
+    stmt = select(entity)
+    if status:
+        stmt = stmt.where(QACheck.status == _status_value(status))
+    if after_id is not None:
+        stmt = stmt.where(
+            QACheck.id < after_id if order_desc else QACheck.id > after_id)
+    elif offset:
+        stmt = stmt.offset(offset)
+    if order_desc:
+        stmt = stmt.order_by(QACheck.id.desc())
+    else:
+        stmt = stmt.order_by(QACheck.id.asc())
+    return stmt.limit(limit)
+
+
+# Сколько строк за раз читается из серверного курсора в iter_qa_checks
+ITER_YIELD_PER = 100
+
+
+def iter_qa_checks(
+    db: Session,
+    limit: int = 50,
+    offset: int = 0,
+    status: Optional[QACheckStatus] = None,
+    order_desc: bool = True,
+    after_id: Optional[int] = None
+) -> Iterator[QACheck]:
+    """
+    Потоковый вариант list_qa_checks (те же фильтры): строки читаются
+    серверным курсором порциями по ITER_YIELD_PER (yield_per), поэтому память
+    не зависит от limit, а первые строки доступны до окончания запроса.
+
+    Генератор, поэтому без @db_operation: ошибки SQLAlchemy пробрасываются
+    при итерации. Сессия должна оставаться открытой до конца обхода.
+    """
+    stmt = _list_qa_checks_stmt(limit, offset, status, order_desc, after_id)
+    yield from db.scalars(
+        stmt.execution_options(yield_per=ITER_YIELD_PER))
+
+
+@db_operation(default_factory=list, rollback=False)
 def find_by_status(
     db: Session,
     status: QACheckStatus,
-    limit: int = 50
+    limit: int = 50,
+    after_id: Optional[int] = None
 ) -> List[QACheck]:
     """
     Возвращает все QACheck с указанным статусом (ограничение limit).
+    after_id — keyset-пагинация (см. list_qa_checks).
     """
-    try:
-        return db.query(QACheck) \
-                 .filter(QACheck.status == status) \
-                 .order_by(QACheck.id.desc()) \
-                 .limit(limit).all()
-    except SQLAlchemyError as e:
-        logger.exception("Error find_by_status: %s", e)
-        return []
-
-
+    # lambda_stmt: SQL собирается и компилируется один раз на вариант
+    # запроса, дальше меняются только параметры (status, after_id, limit)
+    status_value = _status_value(status)
+    stmt = lambda_stmt(lambda: select(QACheck))
+    stmt += lambda s: s.where(QACheck.status == status_value)
+    if after_id is not None:
+        stmt += lambda s: s.where(QACheck.id < after_id)
+    stmt += lambda s: s.order_by(QACheck.id.desc()).limit(limit)
+    return list(db.scalars(stmt).all())
+
+
+@db_operation(default=0)
 def mass_delete_old_checks(
     db: Session,
-    older_than_days: int = 30
+    older_than_days: int = 30,
+    chunk_size: int = 10000,
+    cutoff: Optional[datetime] = None
 ) -> int:
     """
     Пример массового удаления: удаляет QACheck, у которых updated_at < (сейчас - older_than_days).
     Возвращает количество удалённых записей.
+
+    cutoff (tz-aware datetime) можно передать явно — тогда older_than_days
+    игнорируется, а внешний планировщик использует одну границу для всех вызовов.
+
+    Удаляет порциями по chunk_size строк, каждая — в своей транзакции:
+    блокировки держатся недолго, а autovacuum успевает за удалением.
+    Порции выбираются keyset-обходом по id (id > последний id предыдущей
+    порции, ORDER BY id): строки берутся в одном порядке (без взаимных
+    блокировок с параллельным удалением), а уже удалённые «мёртвые» строки
+    не сканируются повторно.
+    При ошибке возвращает 0 (уже закоммиченные порции остаются удалёнными).
     """
-    try:
-        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
-        result = db.query(QACheck).filter(QACheck.updated_at <
-                                          cutoff).delete(synchronize_session=False)
+    # tz-aware UTC, как и колонка DateTime(timezone=True); граница считается
+    # один раз и одинакова для всех порций
+    if cutoff is None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+    total = 0
+    last_id = 0
+    while True:
+        chunk_ids = list(db.scalars(
+            select(QACheck.id)
+            .where(QACheck.updated_at < cutoff, QACheck.id > last_id)
+            .order_by(QACheck.id)
+            .limit(chunk_size)
+        ).all())
+        if not chunk_ids:
+            break
+        stmt = (
+            delete(QACheck)
+            .where(QACheck.id.in_(chunk_ids))
+            .execution_options(synchronize_session=False)
+        )
+        total += db.execute(stmt).rowcount
         db.commit()
-        logger.info(
-            "mass_delete_old_checks(): deleted %d old checks older than %d days", result, older_than_days)
-        return result
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Error mass_delete_old_checks: %s", e)
-        return 0
+        last_id = chunk_ids[-1]
+        if len(chunk_ids) < chunk_size:
+            break
+
+    logger.info(
+        "mass_delete_old_checks(): deleted %d old checks older than %d days", total, older_than_days)
+    return total
 
 # ------------------------------------------------------------------------------
 # QAComment CRUD
 # ------------------------------------------------------------------------------
 
 
+@db_operation()
 def create_qa_comment(db: Session, qa_check_id: int, comment_text: str) -> Optional[QAComment]:
     """
     Создаёт новый комментарий (QAComment) для QACheck (id=qa_check_id).
     Возвращает созданный объект или None при ошибке.
     """
-    try:
-        comment = QAComment(
-            qa_check_id=qa_check_id,
-            comment_text=comment_text
-        )
-        db.add(comment)
-        db.commit()
-        db.refresh(comment)
-        logger.debug("Created QAComment id=%s for qa_check_id=%s",
-                     comment.id, qa_check_id)
-        return comment
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Error creating QAComment: %s", e)
-        return None
-
-
+    stmt = insert(QAComment).values(
+        qa_check_id=qa_check_id,
+        comment_text=comment_text
+    ).returning(QAComment)
+    comment = db.scalars(stmt).one()
+    db.commit()
+    logger.debug("Created QAComment id=%s for qa_check_id=%s",
+                 comment.id, qa_check_id)
+    return comment
+
+
+@db_operation(default_factory=list, rollback=False)
 def list_comments_for_check(db: Session, qa_check_id: int) -> List[QAComment]:
     """
     Возвращает все комментарии (QAComment), связанные с данным QACheck (qa_check_id).
     """
-    try:
-        return db.query(QAComment) \
-                 .filter(QAComment.qa_check_id == qa_check_id) \
-                 .order_by(QAComment.id.desc()) \
-                 .all()
-    except SQLAlchemyError as e:
-        logger.exception(
-            "Error fetching QAComments for check_id=%s: %s", qa_check_id, e)
-        return []
+    stmt = lambda_stmt(
+        lambda: select(QAComment)
+        .where(QAComment.qa_check_id == qa_check_id)
+        .order_by(QAComment.id.desc())
+    )
+    return list(db.scalars(stmt).all())
 
 
+@db_operation(default_factory=dict, rollback=False)
+def count_comments_for_checks(db: Session, check_ids: List[int]) -> Dict[int, int]:
+    """
+    Возвращает {qa_check_id: число комментариев} для переданных проверок
+    одним запросом (COUNT ... GROUP BY по индексу ix_qa_comments_check_id_id),
+    не загружая сами комментарии. Проверки без комментариев в словарь не
+    попадают.
+
+    Пример:
+      checks = list_qa_checks(db, limit=50)
+      counts = count_comments_for_checks(db, [ch.id for ch in checks])
+      counts.get(ch.id, 0)
+    """
+    if not check_ids:
+        return {}
+    stmt = (
+        select(QAComment.qa_check_id, func.count(QAComment.id))
+        .where(QAComment.qa_check_id.in_(check_ids))
+        .group_by(QAComment.qa_check_id)
+    )
+    return dict(db.execute(stmt).all())
+
+
+@db_operation(default=False)
 def delete_qa_comment(db: Session, comment_id: int) -> bool:
     """
     Удаляет комментарий (QAComment) по его id. 
     Возвращает True, если успешно удалён, False — если не найден или ошибка.
     """
-    try:
-        comment = db.query(QAComment).filter(
-            QAComment.id == comment_id).one_or_none()
-        if not comment:
-            return False
-        db.delete(comment)
-        db.commit()
-        logger.debug("Deleted QAComment id=%s", comment_id)
-        return True
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Error deleting QAComment: %s", e)
+    comment = db.get(QAComment, comment_id)
+    if not comment:
         return False
+    db.delete(comment)
+    db.commit()
+    logger.debug("Deleted QAComment id=%s", comment_id)
+    return True
 
 
 # ------------------------------------------------------------------------------
 # Дополнительные репозиториные методы (примеры)
 # ------------------------------------------------------------------------------
+@db_operation()
 def update_comment_text(
     db: Session,
     comment_id: int,
@@ -298,18 +558,11 @@ def update_comment_text(
     """
     Обновляет текст комментария (QAComment), возвращает обновлённый объект или None.
     """
-    try:
-        c = db.query(QAComment).filter(
-            QAComment.id == comment_id).one_or_none()
-        if not c:
-            return None
-        c.comment_text = new_text
-        db.commit()
-        db.refresh(c)
-        logger.debug("Updated QAComment id=%s with new_text length=%d",
-                     comment_id, len(new_text))
-        return c
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Error update_comment_text: %s", e)
+    c = db.get(QAComment, comment_id)
+    if not c:
         return None
+    c.comment_text = new_text
+    db.commit()
+    logger.debug("Updated QAComment id=%s with new_text length=%d",
+                 comment_id, len(new_text))
+    return c
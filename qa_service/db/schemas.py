@@ -0,0 +1,80 @@
+"""
+qa_service/db/schemas.py
+------------------------
+Pydantic-DTO для чтения данных QA-сервиса (без привязки к ORM-сессии).
+
+Содержит:
+  - QACheckRead: «плоская» копия строки qa_checks для ответов API.
+  - CheckTextRequest: тело запроса POST /check-text (routes/qa_routes.py).
+
+DTO заполняются через model_construct() без валидации: данные приходят из БД,
+куда попадают только через ORM-модели (db/models.py), поэтому считаются
+доверенными. Для внешнего ввода (тело запроса и т.п.) используйте
+model_validate().
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class QACheckRead(BaseModel):
+    """Результат проверки текста (строка qa_checks) в виде DTO."""
+
+    # model_construct() схема не нужна: строим её лишь при первой валидации
+    # или сериализации (model_validate / model_dump)
+    model_config = ConfigDict(defer_build=True)
+
+    id: int = Field(..., description="ID проверки")
+    original_text: str = Field(..., description="Исходный текст")
+    filtered_text: str = Field(...,
+                               description="Текст после фильтрации запрещённых слов")
+    found_issues: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Список найденных ошибок [{offset, error_text, suggestions}, ...]")
+    corrected_text: Optional[str] = Field(
+        None, description="Текст после автокоррекции")
+    warnings: Optional[List[str]] = Field(
+        None, description="Список предупреждений")
+    status: str = Field(...,
+                        description="Статус проверки (значение QACheckStatus)")
+    created_at: datetime = Field(..., description="Время создания записи")
+    updated_at: datetime = Field(...,
+                                 description="Время последнего обновления записи")
+
+
+# Код языка LanguageTool: "ru", "en-US", "ca-ES-valencia",
+# "de-DE-x-simple-language" или "auto"; пустая строка — язык по умолчанию.
+# Шаблон компилируется один раз вместе со схемой модели, так что неверный код
+# отсекается ещё при разборе тела (400), до инициализации LanguageTool
+LANGUAGE_CODE_PATTERN = r"^(?:auto|[a-z]{2,3}(?:-[A-Z]{2}(?:-[A-Za-z0-9]+)*)?)?$"
+
+
+class CheckTextRequest(BaseModel):
+    """
+    Тело POST /check-text. Разбирается из сырых байт запроса одним вызовом
+    model_validate_json() (JSON декодируется и типизируется в pydantic-core),
+    поля совпадают с параметрами perform_qa_check.
+    """
+
+    text: str = Field("", description="Исходный текст")
+    auto_correct: bool = Field(False, description="Включить автокоррекцию")
+    add_log_comment: bool = Field(
+        True, description="Создавать QAComment с итогом проверки")
+    store_positions: bool = Field(
+        False, description="Возвращать позиции замен «плохих» слов")
+    store_positions_in_warnings: bool = Field(
+        False, description="Добавлять позиции замен в warnings")
+    restricted_file_path: str = Field(
+        "", description="Файл с «плохими» словами (дополнительно к ENV)")
+    restricted_fuzzy: bool = Field(
+        False, description="Искать «плохие» слова и в составе других слов")
+    restricted_placeholder: str = Field(
+        "***", description="Замена для «плохих» слов")
+    language_code: Optional[str] = Field(
+        None, pattern=LANGUAGE_CODE_PATTERN,
+        description='Код языка LanguageTool, например "ru", "en-US"')
+    ignore_spelling_rules: Optional[List[str]] = Field(
+        None, description="ID правил LanguageTool, отключаемых для запроса")
+    personal_dict: Optional[List[str]] = Field(
+        None, description="Слова, которые не считаются ошибкой")
@@ -0,0 +1,53 @@
+"""
+qa_service/gunicorn.conf.py
+---------------------------
+Конфигурация gunicorn для QA-сервиса.
+
+По умолчанию используются gevent-воркеры: запрос к /check-text почти всё
+время ждёт LanguageTool и PostgreSQL, поэтому один процесс с gevent
+обслуживает сотни одновременных соединений вместо одного.
+
+Запуск:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Параметры берутся из Pydantic-настроек (config/settings.py):
+ - QA_SERVICE_PORT
+ - QA_SERVICE_WORKERS
+ - QA_SERVICE_WORKER_CLASS
+ - QA_SERVICE_WORKER_CONNECTIONS
+"""
+
+from config.settings import get_settings
+
+_settings = get_settings()
+
+bind = f"0.0.0.0:{_settings.QA_SERVICE_PORT}"
+workers = _settings.QA_SERVICE_WORKERS
+worker_class = _settings.QA_SERVICE_WORKER_CLASS
+worker_connections = _settings.QA_SERVICE_WORKER_CONNECTIONS
+
+# Приложение импортируется в каждом воркере после fork: клиент LanguageTool
+# и пулы соединений (HTTP, БД) не должны делиться между процессами.
+preload_app = False
+
+# Логи gunicorn — в stdout/stderr (как и у самого сервиса)
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """
+    psycopg2 — C-расширение, gevent не может пропатчить его сокеты сам.
+    psycogreen устанавливает wait-callback, чтобы сессии SQLAlchemy
+    уступали управление другим greenlet'ам во время ожидания БД.
+    """
+    if worker_class != "gevent":
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning(
+            "psycogreen не установлен: запросы к БД будут блокировать gevent-воркер.")
+        return
+    patch_psycopg()
+    server.log.info("psycopg2 пропатчен для gevent (worker pid=%s).", worker.pid)
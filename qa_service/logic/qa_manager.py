@@ -15,6 +15,8 @@ qa_service/logic/qa_manager.py
   4. Обновляет запись в БД (COMPLETED или FAILED).
   5. (Опционально) добавляет QAComment, если add_log_comment=True.
 
+Для списка текстов — perform_qa_check_batch (одна транзакция на всю пачку).
+
 ПАРАМЕТРЫ, КОТОРЫЕ МОЖНО ПЕРЕДАВАТЬ:
 
   :param db:             SQLAlchemy-сессия
@@ -48,7 +50,14 @@ qa_service/logic/qa_manager.py
 
 """
 
+import copy
+import functools
+import hashlib
 import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Tuple
 
 from sqlalchemy.orm import Session
@@ -56,6 +65,7 @@ from sqlalchemy.orm import Session
 # Базовые CRUD-функции
 from db.repository import (
     create_qa_check,
+    create_qa_checks_bulk,
     update_qa_check_fields,
     create_qa_comment,
 )
@@ -71,6 +81,194 @@ from logic.spell_checker import run_spell_check
 
 logger = logging.getLogger(__name__)
 
+# Сколько текстов perform_qa_check_batch проверяет одновременно. Проверка почти
+# целиком — ожидание ответа LanguageTool-сервера, поэтому потоки перекрывают
+# задержки; значение согласовано с maxCheckThreads сервера (docker-compose.yml).
+BATCH_MAX_WORKERS = 8
+
+# ------------------------------------------------------------------------------
+# Кэш результатов проверки (шаблонные письма, сгенерированные фрагменты
+# приходят на проверку многократно)
+# ------------------------------------------------------------------------------
+# Ключ — хэш текста и все опции, влияющие на результат (включая mtime файла
+# «плохих» слов); значение — результат _run_checks (original_text=None).
+# Запись в БД (QACheck/QAComment) при попадании в кэш делается как обычно.
+QA_CACHE_SIZE = 1024
+# Длинные тексты не кэшируем: результат (filtered/corrected_text) занимает
+# память, а повторяются они редко
+QA_CACHE_MAX_TEXT_LEN = 10000
+
+_QA_CACHE: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_qa_cache_lock = threading.Lock()
+
+
+def _qa_cache_key(text: str, **options: Any) -> Tuple[Any, ...]:
+    """Ключ _QA_CACHE: blake2b-хэш текста + опции (списки -> кортежи)."""
+    file_path = options.get("restricted_file_path") or ""
+    try:
+        file_mtime = os.path.getmtime(file_path) if file_path else None
+    except OSError:
+        file_mtime = None
+    return (
+        hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+        file_mtime,
+        *(tuple(value) if isinstance(value, list) else value
+          for _name, value in sorted(options.items())),
+    )
+
+
+def clear_qa_cache() -> None:
+    """Сбрасывает кэш результатов проверки (например, после смены словарей)."""
+    with _qa_cache_lock:
+        _QA_CACHE.clear()
+
+
+def _check_text(
+    text: str,
+    store_positions_in_warnings: bool = False,
+    **options: Any
+) -> Dict[str, Any]:
+    """
+    Шаги 2-3 perform_qa_check (без БД): _run_checks с кэшированием
+    (см. _QA_CACHE) и, при store_positions_in_warnings, positions в warnings.
+    Исключения пробрасываются вызывающему.
+
+    Кэшируются только «чистые» результаты (без warnings от LanguageTool:
+    недоступный сервер или сбой автокоррекции не должны запоминаться).
+    Возвращает копию: вызывающий может менять результат.
+    """
+    result_dict = None
+    key = None
+    if len(text) <= QA_CACHE_MAX_TEXT_LEN:
+        key = _qa_cache_key(text, **options)
+        with _qa_cache_lock:
+            cached = _QA_CACHE.get(key)
+            if cached is not None:
+                _QA_CACHE.move_to_end(key)
+        if cached is not None:
+            result_dict = copy.deepcopy(cached)
+            result_dict["original_text"] = text
+
+    if result_dict is None:
+        result_dict = _run_checks(text, **options)
+        if key is not None and not result_dict["warnings"]:
+            value = copy.deepcopy({**result_dict, "original_text": None})
+            with _qa_cache_lock:
+                _QA_CACHE[key] = value
+                if len(_QA_CACHE) > QA_CACHE_SIZE:
+                    _QA_CACHE.popitem(last=False)
+
+    # Если нужно «вшить» positions в warnings
+    positions = result_dict.get("positions")
+    if options.get("store_positions") and store_positions_in_warnings and positions:
+        # Сериализуем positions как строку
+        positions_str = f"Positions replaced: {positions}"
+        result_dict["warnings"].append(positions_str)
+    return result_dict
+
+
+def _run_checks(
+    text: str,
+    auto_correct: bool,
+    store_positions: bool,
+    restricted_file_path: str,
+    restricted_fuzzy: bool,
+    restricted_placeholder: str,
+    language_code: Optional[str],
+    ignore_spelling_rules: Optional[List[str]],
+    personal_dict: Optional[List[str]]
+) -> Dict[str, Any]:
+    """
+    Фильтрация «плохих» слов и LanguageTool (без кэша, см. _check_text).
+    Возвращает результат со status="ok" (без check_id).
+    """
+    positions = None
+    if store_positions:
+        # Получаем сразу и «очищенный» текст, и positions
+        filter_result = check_and_replace_bad_words_positions(
+            text=text,
+            file_path=restricted_file_path,
+            placeholder=restricted_placeholder,
+            fuzzy=restricted_fuzzy
+        )
+        filtered_text = filter_result["filtered_text"]
+        positions = filter_result["positions"]
+    else:
+        # Старый путь: просто заменяем
+        filtered_text = filter_bad_words(
+            text=text,
+            file_path=restricted_file_path,
+            placeholder=restricted_placeholder,
+            fuzzy=restricted_fuzzy
+        )
+
+    check_result = run_spell_check(
+        text=filtered_text,
+        auto_correct=auto_correct,
+        language_code=language_code,
+        ignore_rules=ignore_spelling_rules,
+        personal_dict=personal_dict
+    )
+
+    found_issues = check_result.get("found_issues", [])
+    warnings = check_result.get("warnings", [])
+    corrected_text = check_result.get("corrected_text")
+
+    result_dict = {
+        "status": "ok",
+        "original_text": text,
+        "filtered_text": filtered_text,
+        "found_issues": found_issues,
+        "corrected_text": corrected_text,
+        "warnings": warnings
+    }
+    if store_positions:
+        result_dict["positions"] = positions
+    return result_dict
+
+
+def _check_text_safe(
+    text: str,
+    **check_options: Any
+) -> Tuple[Dict[str, Any], QACheckStatus, str]:
+    """
+    _check_text для perform_qa_check_batch: вместо исключения возвращает
+    результат-ошибку. Возвращает (result_dict, статус QACheck, текст QAComment).
+    """
+    try:
+        result_dict = _check_text(text, **check_options)
+        return result_dict, QACheckStatus.COMPLETED, _completed_comment(result_dict)
+    except Exception as e:
+        logger.exception("Ошибка при perform_qa_check_batch: %s", e)
+        return _error_result(text, str(e)), QACheckStatus.FAILED, f"Ошибка QA: {e}"
+
+
+def _completed_comment(result_dict: Dict[str, Any]) -> str:
+    """Текст QAComment для успешной проверки."""
+    comment_text = (
+        f"QA check completed:\n"
+        f"Original(50 chars): {result_dict['original_text'][:50]}...\n"
+        f"Filtered(50 chars): {result_dict['filtered_text'][:50]}...\n"
+        f"Issues: {len(result_dict['found_issues'])}, "
+        f"Warnings: {len(result_dict['warnings'])}"
+    )
+    if result_dict.get("positions"):
+        comment_text += f"\nPositions replaced: {result_dict['positions']}"
+    return comment_text
+
+
+def _error_result(text: str, message: str) -> Dict[str, Any]:
+    """Результат perform_qa_check при ошибке (без check_id)."""
+    return {
+        "status": "error",
+        "message": message,
+        "original_text": text,
+        "filtered_text": "",
+        "found_issues": [],
+        "corrected_text": None,
+        "warnings": [message]
+    }
+
 
 def perform_qa_check(
     db: Session,
@@ -144,83 +342,37 @@ def perform_qa_check(
     )
 
     try:
-        # 2) Фильтрация «плохих» слов
-        positions = None
-        if store_positions:
-            # Получаем сразу и «очищенный» текст, и positions
-            filter_result = check_and_replace_bad_words_positions(
-                text=text,
-                file_path=restricted_file_path,
-                placeholder=restricted_placeholder,
-                fuzzy=restricted_fuzzy
-            )
-            filtered_text = filter_result["filtered_text"]
-            positions = filter_result["positions"]
-        else:
-            # Старый путь: просто заменяем
-            filtered_text = filter_bad_words(
-                text=text,
-                file_path=restricted_file_path,
-                placeholder=restricted_placeholder,
-                fuzzy=restricted_fuzzy
-            )
-
-        # 3) Запуск проверки (орфография/грамматика)
-        check_result = run_spell_check(
-            text=filtered_text,
+        # 2-3) Фильтрация «плохих» слов и проверка орфографии/грамматики
+        result_dict = _check_text(
+            text,
             auto_correct=auto_correct,
+            store_positions=store_positions,
+            store_positions_in_warnings=store_positions_in_warnings,
+            restricted_file_path=restricted_file_path,
+            restricted_fuzzy=restricted_fuzzy,
+            restricted_placeholder=restricted_placeholder,
             language_code=language_code,
-            ignore_rules=ignore_spelling_rules,
+            ignore_spelling_rules=ignore_spelling_rules,
             personal_dict=personal_dict
         )
 
-        found_issues = check_result.get("found_issues", [])
-        warnings = check_result.get("warnings", [])
-        corrected_text = check_result.get("corrected_text")
-
-        # Если нужно «вшить» positions в warnings
-        if store_positions and store_positions_in_warnings and positions:
-            # Сериализуем positions как строку
-            positions_str = f"Positions replaced: {positions}"
-            warnings.append(positions_str)
-
         # 4) Обновляем запись (COMPLETED)
         update_qa_check_fields(
             db=db,
             check_id=qa_check.id,
-            filtered_text=filtered_text,
-            found_issues=found_issues,
-            corrected_text=corrected_text,
-            warnings=warnings,
+            filtered_text=result_dict["filtered_text"],
+            found_issues=result_dict["found_issues"],
+            corrected_text=result_dict["corrected_text"],
+            warnings=result_dict["warnings"],
             status=QACheckStatus.COMPLETED
         )
 
         # (Опционально) QAComment
         if add_log_comment:
-            comment_text = (
-                f"QA check completed:\n"
-                f"Original(50 chars): {text[:50]}...\n"
-                f"Filtered(50 chars): {filtered_text[:50]}...\n"
-                f"Issues: {len(found_issues)}, Warnings: {len(warnings)}"
-            )
-            if store_positions and positions:
-                comment_text += f"\nPositions replaced: {positions}"
-            create_qa_comment(db, qa_check.id, comment_text)
+            create_qa_comment(db, qa_check.id, _completed_comment(result_dict))
 
         # Формируем результат (status="ok")
-        result_dict = {
-            "check_id": qa_check.id,
-            "status": "ok",
-            "original_text": text,
-            "filtered_text": filtered_text,
-            "found_issues": found_issues,
-            "corrected_text": corrected_text,
-            "warnings": warnings
-        }
-        if store_positions:
-            result_dict["positions"] = positions
-
-        return result_dict
+        return {"check_id": qa_check.id, **result_dict}
 
     except Exception as e:
         logger.exception("Ошибка при perform_qa_check: %s", e)
@@ -235,13 +387,77 @@ def perform_qa_check(
         if add_log_comment:
             create_qa_comment(db, qa_check.id, f"Ошибка QA: {e}")
 
-        return {
-            "check_id": qa_check.id,
-            "status": "error",
-            "message": str(e),
+        return {"check_id": qa_check.id, **_error_result(text, str(e))}
+
+
+def perform_qa_check_batch(
+    db: Session,
+    texts: List[str],
+    auto_correct: bool = False,
+    add_log_comment: bool = True,
+    store_positions: bool = False,
+    store_positions_in_warnings: bool = False,
+    restricted_file_path: str = "",
+    restricted_fuzzy: bool = False,
+    restricted_placeholder: str = "***",
+    language_code: Optional[str] = None,
+    ignore_spelling_rules: Optional[List[str]] = None,
+    personal_dict: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Пакетный вариант perform_qa_check для списка текстов (опции те же).
+
+    Сначала все тексты проходят фильтрацию и LanguageTool (без обращений к БД,
+    до BATCH_MAX_WORKERS текстов параллельно; запросы к LanguageTool-серверу
+    идут по общему keep-alive пулу соединений, см. services/language_tool_client.py,
+    без нового TCP-соединения на текст), затем все QACheck (уже COMPLETED/FAILED) и их QAComment записываются
+    одной транзакцией: два INSERT на всю пачку (create_qa_checks_bulk) вместо
+    create + update + comment с отдельным COMMIT на каждый текст.
+    Записи PENDING при этом не создаются.
+
+    :return: список результатов в порядке texts (формат как у perform_qa_check);
+             если запись в БД не удалась — у всех status="error", check_id=None
+    """
+    if not texts:
+        return []
+
+    check = functools.partial(
+        _check_text_safe,
+        auto_correct=auto_correct,
+        store_positions=store_positions,
+        store_positions_in_warnings=store_positions_in_warnings,
+        restricted_file_path=restricted_file_path,
+        restricted_fuzzy=restricted_fuzzy,
+        restricted_placeholder=restricted_placeholder,
+        language_code=language_code,
+        ignore_spelling_rules=ignore_spelling_rules,
+        personal_dict=personal_dict
+    )
+    # Тексты проверяются параллельно (map сохраняет порядок texts)
+    with ThreadPoolExecutor(
+            max_workers=min(BATCH_MAX_WORKERS, len(texts))) as executor:
+        checked = list(executor.map(check, texts))
+
+    results: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    comments: List[Optional[str]] = []
+    for text, (result_dict, status, comment) in zip(texts, checked):
+        results.append(result_dict)
+        rows.append({
             "original_text": text,
-            "filtered_text": "",
-            "found_issues": [],
-            "corrected_text": None,
-            "warnings": [str(e)]
-        }
+            "filtered_text": result_dict["filtered_text"],
+            "found_issues": result_dict["found_issues"],
+            "corrected_text": result_dict["corrected_text"],
+            "warnings": result_dict["warnings"],
+            "status": status,
+        })
+        comments.append(comment if add_log_comment else None)
+
+    ids = create_qa_checks_bulk(db, rows, comments=comments)
+    if len(ids) != len(rows):
+        message = "Не удалось сохранить результаты QA-проверок в БД"
+        return [{"check_id": None, **_error_result(text, message)}
+                for text in texts]
+
+    return [{"check_id": check_id, **result_dict}
+            for check_id, result_dict in zip(ids, results)]
@@ -4,21 +4,47 @@ qa_service/logic/restricted_words_checker.py
 Модуль, отвечающий за фильтрацию «плохих» слов (restricted/bad words) в тексте.
 Содержит:
 1) Функции для загрузки «плохих» слов (из env/settings, текстового файла, комбинированный).
-2) Функции для обнаружения и замены слов:
+2) Функции для обнаружения и замены слов (все слова — одно регулярное
+   выражение-альтернация или, если установлен pyahocorasick, автомат
+   Ахо-Корасик, для очень больших списков — база Hyperscan;
+   см. compile_bad_words_pattern):
    - detect_bad_words(text, bad_words)
    - replace_bad_words(text, bad_words)
 3) Высокоуровневые функции:
    - filter_bad_words(text) (просто «очистить»)
    - check_and_replace_bad_words(text) (вернуть очищенный текст + список обнаруженных)
 4) Дополнительные расширения (варианты placeholder, fuzzy-режим, возврат позиций замен).
+
+Загруженные слова и скомпилированные выражения кэшируются: файл перечитывается
+только при изменении его mtime, настройки неизменяемы (frozen). Для тестов —
+clear_bad_words_cache().
 """
 
 import os
 import re
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+import threading
+from functools import lru_cache
+from typing import (
+    Any, Callable, Collection, Dict, FrozenSet, Iterable, List, Optional, Set,
+    Tuple
+)
 from config.settings import get_settings
 
+try:
+    # Опционально: автомат Ахо-Корасик для fuzzy-режима (один линейный проход)
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    # Опционально: многошаблонный DFA-поиск (SIMD) для очень больших списков
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------------------------
@@ -26,107 +52,453 @@ logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------
 
 
-def load_bad_words_from_env() -> List[str]:
+def load_bad_words_from_env() -> FrozenSet[str]:
     """
     Загружает «плохие» слова из настроек (через Pydantic),
     либо из окружения (если settings.bad_words_list не пуст).
 
-    Возвращает список слов (в нижнем регистре, без дубликатов).
+    Возвращает множество слов (в нижнем регистре). Порядок потребителям не
+    важен, поэтому слова не сортируются.
 
     Пример:
         settings.bad_words_list = ["плохое_слово1", "  плохое_слово2 "]
-        => ["плохое_слово1", "плохое_слово2"]
+        => frozenset({"плохое_слово1", "плохое_слово2"})
     """
+    return _load_env_words()
+
+
+@lru_cache(maxsize=1)
+def _load_env_words() -> FrozenSet[str]:
     settings = get_settings()
     # например, ["плохое_слово1", "плохое_слово2"]
     raw_list = settings.bad_words_list
-    cleaned = set(w.strip().lower() for w in raw_list if w.strip())
-    bad_words = sorted(cleaned)
+    bad_words = frozenset(w.strip().lower() for w in raw_list if w.strip())
     logger.debug("Loaded %d bad words from settings/env", len(bad_words))
     return bad_words
 
 
-def load_bad_words_from_file(filepath: str) -> List[str]:
+def _file_mtime(filepath: str) -> Optional[float]:
+    """mtime файла (ключ кэша) или None, если файла нет."""
+    try:
+        return os.path.getmtime(filepath)
+    except OSError:
+        return None
+
+
+def load_bad_words_from_file(filepath: str) -> FrozenSet[str]:
     """
     Считывает «плохие» слова из текстового файла (один word/шаблон на строку).
-    Возвращает список (нижний регистр, без дубликатов).
-    Если файл не найден, логирует ошибку и возвращает пустой список.
+    Возвращает frozenset (нижний регистр).
+    Если файл не найден, логирует ошибку и возвращает пустое множество.
 
     Пример формата файла:
         плохое_слово1
         badword2
         # пустые строки игнорируются
+
+    Результат кэшируется по (путь, mtime): файл читается заново только после
+    его изменения.
     """
-    if not os.path.exists(filepath):
+    return _load_file(filepath, _file_mtime(filepath))
+
+
+@lru_cache(maxsize=8)
+def _load_file(filepath: str, mtime: Optional[float]) -> FrozenSet[str]:
+    if mtime is None:
         logger.error("Bad words file not found: %s", filepath)
-        return []
+        return frozenset()
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            lines = [line.strip().lower() for line in f if line.strip()]
-        cleaned = set(lines)
-        bad_words = sorted(cleaned)
+            # генератор: без промежуточного списка строк и сортировки
+            bad_words = frozenset(
+                word for word in (line.strip().lower() for line in f) if word)
         logger.debug("Loaded %d bad words from file %s",
                      len(bad_words), filepath)
         return bad_words
     except Exception as e:
         logger.exception("Failed to load bad words from file: %s", e)
-        return []
+        return frozenset()
 
 
-def get_combined_bad_words(file_path: str = "") -> List[str]:
+def get_combined_bad_words(file_path: str = "") -> FrozenSet[str]:
     """
     Пример функции, объединяющей «плохие» слова из ENV и из файла (если file_path указан).
-    Возвращает общий уникальный список (отсортированный).
+    Возвращает общее множество слов (frozenset).
 
     Пример:
-        env_words = ["плохое_слово1"]
-        file_words = ["word2", "word3"]
-        => ["плохое_слово1", "word2", "word3"]
-    """
-    env_words = load_bad_words_from_env()
-    file_words = load_bad_words_from_file(file_path) if file_path else []
-    combined = set(env_words + file_words)
-    result = sorted(combined)
+        env_words = {"плохое_слово1"}
+        file_words = {"word2", "word3"}
+        => frozenset({"плохое_слово1", "word2", "word3"})
+    """
+    mtime = _file_mtime(file_path) if file_path else None
+    return _combined_bad_words(file_path, mtime)
+
+
+@lru_cache(maxsize=8)
+def _combined_bad_words(file_path: str, mtime: Optional[float]) -> FrozenSet[str]:
+    env_words = _load_env_words()
+    if not file_path:
+        result = env_words
+    else:
+        result = env_words | _load_file(file_path, mtime)
     logger.info("Combined total bad words count = %d", len(result))
     return result
 
 
+# Скомпилированные выражения: (file_path, fuzzy) -> (mtime файла, слова, pattern).
+# При изменении mtime запись перестраивается (а не копится рядом со старой).
+_PATTERN_CACHE: Dict[Tuple[str, bool],
+                     Tuple[Optional[float], FrozenSet[str], Optional[re.Pattern]]] = {}
+
+
+def _get_patterns(
+    file_path: str,
+    fuzzy: bool
+) -> Tuple[FrozenSet[str], Optional[re.Pattern]]:
+    """
+    Возвращает (bad_words, pattern) для file_path/fuzzy из кэша, при промахе —
+    загружает слова (get_combined_bad_words) и компилирует альтернацию.
+    """
+    mtime = _file_mtime(file_path) if file_path else None
+    key = (file_path, fuzzy)
+    cached = _PATTERN_CACHE.get(key)
+    if cached is None or cached[0] != mtime:
+        bad_words = _combined_bad_words(file_path, mtime)
+        cached = (mtime, bad_words,
+                  compile_bad_words_pattern(bad_words, fuzzy=fuzzy))
+        _PATTERN_CACHE[key] = cached
+    return cached[1], cached[2]
+
+
+def clear_bad_words_cache() -> None:
+    """Сбрасывает кэши загруженных слов и скомпилированных выражений (для тестов)."""
+    _load_env_words.cache_clear()
+    _load_file.cache_clear()
+    _combined_bad_words.cache_clear()
+    _PATTERN_CACHE.clear()
+    _compile_filter.cache_clear()
+
+
 # ------------------------------------------------------------------------------
 # 2. Обнаружение/замена «плохих» слов в тексте
 # ------------------------------------------------------------------------------
 
-def detect_bad_words(text: str, bad_words: List[str]) -> List[str]:
+class _Span:
+    """Минимальный аналог re.Match для _AhoCorasickPattern: span() и group(0)."""
+
+    __slots__ = ("_text", "_start", "_end")
+
+    def __init__(self, text: str, start: int, end: int):
+        self._text = text
+        self._start = start
+        self._end = end
+
+    def span(self) -> Tuple[int, int]:
+        return self._start, self._end
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def group(self, index: int = 0) -> str:
+        return self._text[self._start:self._end]
+
+
+class _AhoCorasickPattern:
+    """
+    Поиск bad_words автоматом Ахо-Корасик (pyahocorasick, C-расширение) с тем
+    же интерфейсом, что и у re.Pattern (finditer / findall / sub), поэтому
+    функции ниже работают с ним так же, как с регулярным выражением.
+
+    Один проход по text.lower() находит все вхождения всех слов; из них, как и в
+    регулярной альтернации, выбираются непересекающиеся: самое левое, при
+    равном начале — самое длинное. В строгом режиме (word_boundaries=True),
+    а в fuzzy-режиме для слов короче FUZZY_MIN_WORD_LEN вхождения без \b с
+    обеих сторон отбрасываются до этого выбора — как альтернативы с \b, не
+    прошедшие проверку границы.
+    Если lower() меняет длину текста (редкие символы вроде «İ»), позиции бы
+    разъехались — тогда используется fallback (регулярное выражение).
+    """
+
+    def __init__(
+        self,
+        words: List[str],
+        fallback: re.Pattern,
+        word_boundaries: bool = False
+    ):
+        self._fallback = fallback
+        self._automaton = ahocorasick.Automaton()
+        for word in words:
+            lowered = word.lower()
+            strict = word_boundaries or len(word) < FUZZY_MIN_WORD_LEN
+            self._automaton.add_word(lowered, (len(lowered), strict))
+        self._automaton.make_automaton()
+
+    def finditer(self, text: str):
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            yield from self._fallback.finditer(text)
+            return
+        spans = sorted(
+            (end_idx - length + 1, -length, strict)
+            for end_idx, (length, strict) in self._automaton.iter(lowered)
+        )
+        last_end = 0
+        for start, neg_length, strict in spans:
+            if start < last_end:
+                continue
+            end = start - neg_length
+            if strict and not (
+                    _is_boundary(text, start) and _is_boundary(text, end)):
+                continue
+            last_end = end
+            yield _Span(text, start, last_end)
+
+    def findall(self, text: str) -> List[str]:
+        return [m.group(0) for m in self.finditer(text)]
+
+    def sub(self, repl, text: str) -> str:
+        return _sub_spans(self.finditer(text), repl, text)
+
+
+def _sub_spans(matches, repl, text: str) -> str:
+    """pattern.sub() для _AhoCorasickPattern/_HyperscanPattern: склейка за один проход."""
+    parts = []
+    last = 0
+    for m in matches:
+        start, end = m.span()
+        parts.append(text[last:start])
+        parts.append(repl(m) if callable(repl) else repl)
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+# Слова короче этого и в fuzzy-режиме ищутся только целиком (\bслово\b):
+# однобуквенное «слово» иначе совпадало бы в каждом абзаце текста
+FUZZY_MIN_WORD_LEN = 3
+
+# С какого размера списка (в обоих режимах) поиск переходит на Hyperscan: на
+# коротких списках альтернация re и автомат не уступают, а компиляция базы дороже
+HYPERSCAN_MIN_WORDS = 200
+
+
+def _is_word_char(ch: str) -> bool:
+    """Является ли символ «словесным» (как \w в re)."""
+    return ch.isalnum() or ch == "_"
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    """Есть ли в позиции pos граница слова (как \b в re)."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+class _HyperscanPattern:
+    """
+    Поиск bad_words базой Hyperscan с интерфейсом re.Pattern (finditer /
+    findall / sub), как у _AhoCorasickPattern: строгий (\bслово\b) или, при
+    word_boundaries=False, fuzzy-режим (границы — только у слов короче
+    FUZZY_MIN_WORD_LEN).
+
+    \b в режиме UCP Hyperscan не поддерживает, поэтому база ищет слова без
+    границ, а границы проверяются при разборе совпадений. Смещения Hyperscan
+    байтовые (UTF-8) и переводятся в символьные. Из пересекающихся совпадений
+    выбирается самое левое, при равном начале — самое длинное (как в
+    альтернации, отсортированной по убыванию длины).
+    """
+
+    def __init__(self, db: "hyperscan.Database", strict_ids: FrozenSet[int]):
+        self._db = db
+        # id слов, совпадения которых требуют \b с обеих сторон
+        self._strict_ids = strict_ids
+        # scratch-пространство базы нельзя использовать из двух потоков сразу
+        self._lock = threading.Lock()
+
+    @classmethod
+    def compile(
+        cls,
+        words: List[str],
+        word_boundaries: bool = True
+    ) -> Optional["_HyperscanPattern"]:
+        """Компилирует базу; при ошибке возвращает None (тогда используется re)."""
+        expressions = [re.escape(w).encode("utf-8") for w in words]
+        flags = [
+            hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SOM_LEFTMOST
+        ] * len(expressions)
+        try:
+            db = hyperscan.Database()
+            db.compile(expressions=expressions,
+                       ids=list(range(len(expressions))), flags=flags)
+        except Exception as e:
+            logger.warning(
+                "Hyperscan: не удалось скомпилировать bad words (%s), используется re.", e)
+            return None
+        strict_ids = frozenset(
+            i for i, w in enumerate(words)
+            if word_boundaries or len(w) < FUZZY_MIN_WORD_LEN)
+        return cls(db, strict_ids)
+
+    def finditer(self, text: str):
+        data = text.encode("utf-8")
+        byte_spans: List[Tuple[int, int, bool]] = []
+        strict_ids = self._strict_ids
+
+        def on_match(word_id, start, end, _flags, _context):
+            byte_spans.append((start, end, word_id in strict_ids))
+
+        with self._lock:
+            self._db.scan(data, match_event_handler=on_match)
+        if not byte_spans:
+            return
+
+        # Байтовые смещения -> символьные одним проходом по отсортированным позициям
+        char_at: Dict[int, int] = {}
+        prev_byte = prev_char = 0
+        for pos in sorted({p for b_start, b_end, _strict in byte_spans
+                           for p in (b_start, b_end)}):
+            prev_char += len(data[prev_byte:pos].decode("utf-8"))
+            prev_byte = pos
+            char_at[pos] = prev_char
+
+        spans = []
+        for b_start, b_end, strict in byte_spans:
+            start, end = char_at[b_start], char_at[b_end]
+            if strict and not (
+                    _is_boundary(text, start) and _is_boundary(text, end)):
+                continue
+            spans.append((start, -end))
+        last_end = 0
+        for start, neg_end in sorted(spans):
+            if start < last_end:
+                continue
+            last_end = -neg_end
+            yield _Span(text, start, last_end)
+
+    def findall(self, text: str) -> List[str]:
+        return [m.group(0) for m in self.finditer(text)]
+
+    def sub(self, repl, text: str) -> str:
+        return _sub_spans(self.finditer(text), repl, text)
+
+
+def compile_bad_words_pattern(
+    bad_words: Iterable[str],
+    fuzzy: bool = False
+) -> Optional[re.Pattern]:
+    """
+    Собирает все bad_words в одно регулярное выражение-альтернацию:
+      строгий режим: \b(?:w1|w2|...)\b
+      fuzzy-режим:   (?:w1|w2|...)        (в том числе в составе слов)
+    Текст сканируется один раз, а не по разу на каждое слово.
+    В fuzzy-режиме слова короче FUZZY_MIN_WORD_LEN (1-2 символа) всё равно
+    ищутся только целиком (\bw\b): иначе «а» или «of» заменялись бы внутри
+    почти каждого слова текста.
+
+    Слова сортируются по убыванию длины: в точке совпадения выигрывает самое
+    длинное слово («плохое слово» раньше, чем «плохое»); слова одной длины —
+    по алфавиту, чтобы текст выражения не зависел от порядка обхода frozenset
+    (он меняется между процессами из-за рандомизации хэшей строк). Это
+    единственная сортировка — сами списки слов хранятся как frozenset, и она
+    выполняется один раз на промах кэша (_get_patterns).
+    Для списков от HYPERSCAN_MIN_WORDS слов при установленном hyperscan
+    возвращается _HyperscanPattern (в обоих режимах). Иначе при установленном
+    pyahocorasick (закреплён в requirements.txt) — _AhoCorasickPattern (тот же
+    интерфейс, поиск за один проход автомата; в строгом режиме — с проверкой
+    границ слов). Само регулярное выражение возвращается только без
+    pyahocorasick, а с ним служит запасным путём автомата.
+    Возвращает None, если список пуст.
+    """
+    # Инвариант: длинные слова раньше коротких (иначе «ass» в альтернации
+    # скрыл бы «assassin»), равные по длине — по алфавиту
+    words = sorted({bw for bw in bad_words if bw}, key=lambda w: (-len(w), w))
+    if not words:
+        return None
+    # Hyperscan — первым: регулярное выражение ему не нужно, и оно
+    # компилируется только для автомата (запасной путь) или как результат
+    if HYPERSCAN_AVAILABLE and len(words) >= HYPERSCAN_MIN_WORDS:
+        hs_pattern = _HyperscanPattern.compile(
+            words, word_boundaries=not fuzzy)
+        if hs_pattern is not None:
+            return hs_pattern
+    if fuzzy:
+        fuzzy_alternation = "|".join(
+            re.escape(w) if len(w) >= FUZZY_MIN_WORD_LEN
+            else rf"\b{re.escape(w)}\b"
+            for w in words
+        )
+        pattern = re.compile(f"(?:{fuzzy_alternation})", re.IGNORECASE)
+    else:
+        alternation = "|".join(map(re.escape, words))
+        pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+    if AHOCORASICK_AVAILABLE:
+        return _AhoCorasickPattern(
+            words, fallback=pattern, word_boundaries=not fuzzy)
+    return pattern
+
+
+def _found_from_matches(matched: List[str], bad_words: Iterable[str]) -> List[str]:
+    """
+    Переводит найденные фрагменты текста в слова из bad_words
+    (в том виде, как они перечислены в bad_words), отсортированные.
+    """
+    # Чистый текст (обычный случай) — без прохода по всему списку слов
+    if not matched:
+        return []
+    matched_lower = {m.lower() for m in matched}
+    return sorted(bw for bw in bad_words if bw.lower() in matched_lower)
+
+
+def detect_bad_words(
+    text: str,
+    bad_words: Collection[str],
+    pattern: Optional[re.Pattern] = None,
+    min_word_len: int = 0
+) -> List[str]:
     """
     Проверяет, какие из bad_words присутствуют в тексте (игнорируя регистр).
-    Возвращает список найденных слов (в том виде, как они перечислены в bad_words),
-    если найдено совпадение по \bслово\b.
+    Возвращает отсортированный список найденных слов (в том виде, как они
+    перечислены в bad_words), если найдено совпадение по \bслово\b.
+
+    pattern — готовое выражение из compile_bad_words_pattern() (если не
+    передано, собирается из bad_words). min_word_len — длина самого короткого
+    слова, посчитанная вместе с pattern: более короткий текст не сканируется.
 
     Пример:
         text = "Это плохое_слово1 пример"
-        bad_words = ["плохое_слово1", "другое_слово"]
+        bad_words = frozenset({"плохое_слово1", "другое_слово"})
         => ["плохое_слово1"]
     """
-    found = []
-    text_lower = text.lower()
-    for bw in bad_words:
-        pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-        if pattern.search(text_lower):
-            found.append(bw)
-    return found
+    # Регистр учитывает само выражение (IGNORECASE / поиск по lower() внутри
+    # «псевдо-Pattern»), отдельный text.lower() здесь не нужен.
+    # Текст короче самого короткого слова не может его содержать (длину
+    # считает вызывающий один раз на список, а не этот вызов — по всем словам)
+    if not bad_words or len(text) < min_word_len:
+        return []
+    if pattern is None:
+        pattern = compile_bad_words_pattern(bad_words)
+    if pattern is None:
+        return []
+    return _found_from_matches(pattern.findall(text), bad_words)
 
 
 def replace_bad_words(
     text: str,
-    bad_words: List[str],
+    bad_words: Iterable[str],
     placeholder: str = "***",
-    fuzzy: bool = False
+    fuzzy: bool = False,
+    pattern: Optional[re.Pattern] = None
 ) -> str:
     """
     Заменяет все вхождения слов из bad_words на placeholder (по умолчанию '***').
 
     Параметры:
      - text: исходный текст
-     - bad_words: список слов (строгое сопоставление)
+     - bad_words: слова (список или frozenset; строгое сопоставление)
      - placeholder: строка, которой заменяем (по умолч. '***')
      - fuzzy: если True, используем более «мягкий» поиск 
        (не только \bслово\b, но и в составе слов). 
@@ -138,26 +510,24 @@ def replace_bad_words(
         => "Это *** пример"
 
     Если fuzzy=True, то "плохое" найдётся в "плохое_слово1" 
-    даже если нет границы слова:
-        pattern = re.compile(re.escape(bw), re.IGNORECASE)
-    иначе:
-        pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
+    даже если нет границы слова (см. compile_bad_words_pattern). Слова из
+    1-2 символов и при fuzzy=True заменяются только целиком.
+
+    pattern — готовое выражение (тогда bad_words/fuzzy не используются).
+    Замена — один проход sub со строкой-заменой (_compile_filter), без
+    вызова функции на каждое совпадение.
     """
-    filtered_text = text
-    for bw in bad_words:
-        if fuzzy:
-            pattern = re.compile(re.escape(bw), re.IGNORECASE)
-        else:
-            pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-        filtered_text = pattern.sub(placeholder, filtered_text)
-    return filtered_text
+    if pattern is None:
+        pattern = compile_bad_words_pattern(bad_words, fuzzy=fuzzy)
+    return _compile_filter(pattern, placeholder)(text)
 
 
 def replace_bad_words_positions(
     text: str,
-    bad_words: List[str],
+    bad_words: Iterable[str],
     placeholder: str = "***",
-    fuzzy: bool = False
+    fuzzy: bool = False,
+    pattern: Optional[re.Pattern] = None
 ) -> Dict[str, Any]:
     """
     Аналог replace_bad_words, но возвращает словарь:
@@ -165,30 +535,78 @@ def replace_bad_words_positions(
         "filtered_text": str,
         "positions": List[Tuple[int, int, str]]  # (start, end, matched_word)
       }
-    где positions — это список позиций, в которых была произведена замена, 
-    вместе с исходным словом.
+    где positions — это список позиций (в исходном тексте), в которых была
+    произведена замена, вместе с исходным словом.
 
     Полезно, если нужно подсветить в интерфейсе, где были «запрещённые слова».
+    pattern — как в replace_bad_words.
     """
-    filtered_text = text
-    positions = []
+    if pattern is None:
+        pattern = compile_bad_words_pattern(bad_words, fuzzy=fuzzy)
+    if pattern is None:
+        return {"filtered_text": text, "positions": []}
 
-    for bw in bad_words:
-        if fuzzy:
-            pattern = re.compile(re.escape(bw), re.IGNORECASE)
-        else:
-            pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
+    filtered_text, positions, _found = _scan_and_replace(
+        text, pattern, placeholder)
+    return {"filtered_text": filtered_text, "positions": positions}
 
-        # iter find - найдём все вхождения
-        for match_obj in pattern.finditer(filtered_text):
-            start, end = match_obj.span()
-            matched_str = match_obj.group(0)
-            positions.append((start, end, matched_str))
 
-        # После определения позиций заменим
-        filtered_text = pattern.sub(placeholder, filtered_text)
+def _scan_and_replace(
+    text: str,
+    pattern: re.Pattern,
+    placeholder: str
+) -> Tuple[str, List[Tuple[int, int, str]], Set[str]]:
+    """
+    Один проход finditer по тексту вместо отдельных findall/finditer/sub.
+    Возвращает (filtered_text, positions, found_set):
+      - filtered_text: text, где совпадения заменены на placeholder
+        (собирается из кусков между совпадениями через "".join);
+      - positions: [(start, end, matched), ...] в исходном text;
+      - found_set: найденные фрагменты в нижнем регистре.
+    """
+    parts: List[str] = []
+    positions: List[Tuple[int, int, str]] = []
+    found_set: Set[str] = set()
+    last = 0
+    for match_obj in pattern.finditer(text):
+        start, end = match_obj.span()
+        matched = match_obj.group(0)
+        parts.append(text[last:start])
+        parts.append(placeholder)
+        positions.append((start, end, matched))
+        found_set.add(matched.lower())
+        last = end
+    if not positions:
+        return text, positions, found_set
+    parts.append(text[last:])
+    return "".join(parts), positions, found_set
+
+
+@lru_cache(maxsize=32)
+def _compile_filter(
+    pattern: Optional[re.Pattern],
+    placeholder: str
+) -> Callable[[str], str]:
+    """
+    Специализированная функция замены для пары (pattern, placeholder):
+    замыкание с выражением и placeholder в ячейках, без разбора аргументов и
+    вызова lambda на каждое совпадение (у re.Pattern замена — строкой, шаблон
+    которой re разбирает один раз). pattern — из _get_patterns; после
+    перестройки выражения старая запись просто вытесняется из кэша.
+    """
+    if pattern is None:
+        return lambda text: text
+    if isinstance(pattern, re.Pattern):
+        # Обратные слэши placeholder — буквальные, а не ссылки на группы
+        repl = placeholder.replace("\\", "\\\\")
+    else:
+        # «Псевдо-Pattern» и так вставляет строку-замену как есть
+        repl = placeholder
+    sub = pattern.sub
 
-    return {"filtered_text": filtered_text, "positions": positions}
+    def _filter(text: str) -> str:
+        return sub(repl, text)
+    return _filter
 
 
 # ------------------------------------------------------------------------------
@@ -214,10 +632,8 @@ def filter_bad_words(
 
     :return: «очищенный» текст
     """
-    bad_words = get_combined_bad_words(file_path)
-    filtered_text = replace_bad_words(
-        text, bad_words, placeholder=placeholder, fuzzy=fuzzy)
-    return filtered_text
+    _bad_words, pattern = _get_patterns(file_path, fuzzy)
+    return _compile_filter(pattern, placeholder)(text)
 
 
 def check_and_replace_bad_words(
@@ -241,11 +657,15 @@ def check_and_replace_bad_words(
     :return: (filtered_text, found_list) 
        где found_list — список тех bad_words, что были найдены
     """
-    bad_words = get_combined_bad_words(file_path)
-    found_list = detect_bad_words(text, bad_words) if not fuzzy else [
-    ]  # fuzzy detect? optional
-    filtered_text = replace_bad_words(
-        text, bad_words, placeholder=placeholder, fuzzy=fuzzy)
+    bad_words, pattern = _get_patterns(file_path, fuzzy)
+    if pattern is None:
+        return (text, [])
+
+    # Один проход: и замена, и список найденных (для fuzzy found_list
+    # по-прежнему пуст)
+    filtered_text, _positions, found_set = _scan_and_replace(
+        text, pattern, placeholder)
+    found_list = [] if fuzzy else sorted(found_set & bad_words)
     return (filtered_text, found_list)
 
 
@@ -275,16 +695,17 @@ def check_and_replace_bad_words_positions(
              "found_list": ["badword"]
            }
     """
-    bad_words = get_combined_bad_words(file_path)
-
-    # Если fuzzy=False, можем собрать found_list через detect_bad_words
-    # Иначе нужно отдельно реализовать fuzzy-поиск. Ниже — упрощённый вариант.
-    found_list = detect_bad_words(text, bad_words) if not fuzzy else []
-
-    replace_info = replace_bad_words_positions(
-        text, bad_words, placeholder=placeholder, fuzzy=fuzzy)
+    bad_words, pattern = _get_patterns(file_path, fuzzy)
+    if pattern is None:
+        return {"filtered_text": text, "positions": [], "found_list": []}
+
+    # Замена, позиции и found_list — за один проход по тексту.
+    # Для fuzzy=False, как и раньше; fuzzy-поиск found_list не заполняет.
+    filtered_text, positions, found_set = _scan_and_replace(
+        text, pattern, placeholder)
+    found_list = [] if fuzzy else sorted(found_set & bad_words)
     return {
-        "filtered_text": replace_info["filtered_text"],
-        "positions": replace_info["positions"],
+        "filtered_text": filtered_text,
+        "positions": positions,
         "found_list": found_list
     }
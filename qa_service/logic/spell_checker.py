@@ -25,19 +25,31 @@ qa_service/logic/spell_checker.py
     }
 """
 
+import atexit
+import copy
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 
 import language_tool_python
+from language_tool_python.utils import correct
 from config.settings import get_settings
+from services.language_tool_client import (
+    _WORDY_RE, _is_whitelisted, create_language_tool
+)
 
 logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------------------------
 # 1. Инициализация инструмента LanguageTool
 # ------------------------------------------------------------------------------
-# Опционально: Можно сделать ленивую инициализацию через get_tool().
-# Здесь — для примера сразу создаём при импортировании модуля.
+# Инструменты создаются через create_language_tool(): при заданном
+# QA_LT_REMOTE_URL — клиент к общему LanguageTool-серверу (одна JVM с прогретыми
+# моделями для всех языков), иначе — локальный сервер, как раньше.
+# Создание ленивое: при первой проверке на данном языке (get_tool), а не при
+# импорте — процессы, которые не проверяют текст (миграции, CLI, тесты),
+# не запускают JVM. Дальше — по одному инструменту на язык (_TOOLS).
 
 try:
     _settings = get_settings()
@@ -46,65 +58,92 @@ except Exception as e:
     logger.exception("Ошибка при загрузке настроек: %s", e)
     DEFAULT_LANGUAGE = "en-US"  # fallback, если нет настроек
 
-try:
-    # Создаём дефолтный инструмент (можно будет перенастроить)
-    tool = language_tool_python.LanguageTool(DEFAULT_LANGUAGE)
-    logger.info(
-        "LanguageTool инициализирован (язык по умолчанию: %s).", DEFAULT_LANGUAGE)
-except Exception as e:
-    logger.error("Не удалось инициализировать LanguageTool: %s", e)
-    tool = None
+# Инструменты по коду языка
+_TOOLS: Dict[str, language_tool_python.LanguageTool] = {}
+# Чтобы параллельные первые запросы (perform_qa_check_batch) не подняли
+# два инструмента (две JVM) для одного языка
+_tools_lock = threading.Lock()
 
 
-# ------------------------------------------------------------------------------
-# 2. Вспомогательная функция для добавления персонального словаря
-# ------------------------------------------------------------------------------
-def add_personal_dictionary(tool_instance: language_tool_python.LanguageTool, words: List[str]) -> None:
+def get_tool(language_code: str) -> language_tool_python.LanguageTool:
     """
-    Добавляет персональный список слов «words» в инструмент LanguageTool,
-    чтобы они не считались ошибками.
-    Пример: add_personal_dictionary(tool, ["QAService", "InnVision", "microservices"])
-
-    :param tool_instance: Экземпляр LanguageTool
-    :param words: Список слов, которые нужно добавить в «Whitelist».
+    Возвращает LanguageTool для language_code, создавая его при первом запросе
+    языка. Ошибки создания пробрасываются (в кэш ничего не попадает).
     """
-    if not tool_instance:
-        logger.warning(
-            "LanguageTool не инициализирован, пропускаем add_personal_dictionary.")
-        return
-    for w in words:
-        w_stripped = w.strip()
-        if w_stripped:
-            tool_instance.add_dictionary_word(w_stripped)
-    logger.debug(
-        "Добавлено %d слов в персональный словарь LanguageTool", len(words))
+    lt = _TOOLS.get(language_code)
+    if lt is None:
+        with _tools_lock:
+            lt = _TOOLS.get(language_code)
+            if lt is None:
+                logger.debug(
+                    "Инициализируем LanguageTool для языка: %s", language_code)
+                lt = create_language_tool(language_code)
+                _TOOLS[language_code] = lt
+                logger.info(
+                    "LanguageTool инициализирован (язык: %s).", language_code)
+    return lt
+
+
+def _close_all_tools() -> None:
+    """Закрывает все инструменты (останавливает локальные JVM) при выходе."""
+    for lt in list(_TOOLS.values()):
+        try:
+            lt.close()
+        except Exception as e:
+            logger.warning("Не удалось закрыть LanguageTool: %s", e)
+    _TOOLS.clear()
+
+
+atexit.register(_close_all_tools)
 
 
 # ------------------------------------------------------------------------------
-# 3. Игнорируемые правила
+# 2. Кэш результатов LanguageTool
 # ------------------------------------------------------------------------------
-def disable_rules(tool_instance: language_tool_python.LanguageTool, rules: List[str]) -> None:
+# Одинаковые тексты (шаблоны после фильтрации) проверяются повторно часто.
+# Ключ — язык, текст и правила, отключённые для запроса (плюс отключённые в
+# самом инструменте). Правила запроса передаются в check_with, а personal_dict
+# применяется к результату (_is_whitelisted) — сам инструмент не меняется,
+# поэтому кэш не нужно сбрасывать. Длинные тексты не кэшируются, чтобы кэш не
+# разрастался в памяти.
+CHECK_CACHE_SIZE = 4096
+CHECK_CACHE_MAX_TEXT_LEN = 10000
+
+
+@lru_cache(maxsize=CHECK_CACHE_SIZE)
+def _cached_check(
+    language_code: str,
+    text: str,
+    rules_key: FrozenSet[str]
+) -> Tuple[Any, ...]:
     """
-    Отключает указанные правила в LanguageTool.
-    Пример: disable_rules(tool, ["WHITESPACE_RULE", "EN_QUOTES"])
+    Результат get_tool(language_code).check_with(text, rules_key) в виде
+    кортежа Match. Объекты Match общие для всех вызовов: не изменяйте их
+    (см. run_spell_check).
     """
-    if not tool_instance:
-        logger.warning(
-            "LanguageTool не инициализирован, пропускаем disable_rules.")
-        return
+    return tuple(get_tool(language_code).check_with(
+        text, disabled_rules=rules_key))
+
+
+def _check(
+    lt: language_tool_python.LanguageTool,
+    language_code: str,
+    text: str,
+    ignore_rules: Optional[List[str]]
+) -> Tuple[Any, ...]:
+    rules_key = frozenset(lt.disabled_rules).union(ignore_rules or ())
+    if len(text) > CHECK_CACHE_MAX_TEXT_LEN:
+        return tuple(lt.check_with(text, disabled_rules=rules_key))
+    return _cached_check(language_code, text, rules_key)
+
 
-    # Для отключения правил LanguageTool в python есть метод .disabled_rules
-    # Можно напрямую присвоить список:
-    # tool.disabled_rules = ["RULE_1", "RULE_2", ...]
-    existing = tool_instance.disabled_rules
-    new_set = set(existing) | set(rules)
-    tool_instance.disabled_rules = list(new_set)
-    logger.debug("Отключили %d правил в LanguageTool, всего отключено: %d",
-                 len(rules), len(tool_instance.disabled_rules))
+def _is_trivial_text(text: str) -> bool:
+    """True, если в тексте нет ни одного слова из двух и более букв."""
+    return _WORDY_RE.search(text) is None
 
 
 # ------------------------------------------------------------------------------
-# 4. Основная функция run_spell_check
+# 3. Основная функция run_spell_check
 # ------------------------------------------------------------------------------
 def run_spell_check(
     text: str,
@@ -135,56 +174,69 @@ def run_spell_check(
     found_issues = []
     corrected_text = None
 
-    if not tool:
-        # Если не удалось инициализировать LanguageTool при импорте
-        # или произошла ошибка, мы возвращаем предупреждение
-        logger.warning(
-            "LanguageTool недоступен (tool=None). Проверка не выполнена.")
+    # Быстрый путь: пустой/нетекстовый ввод не отправляем в LanguageTool
+    # (HTTP-запрос и прогон правил стоят одинаково даже для пустой строки)
+    if _is_trivial_text(text):
         return {
             "found_issues": found_issues,
-            "warnings": ["LanguageTool not initialized"],
-            "corrected_text": corrected_text
+            "warnings": warnings,
+            "corrected_text": text if auto_correct else None
         }
 
-    # Если пользователь хочет другой язык, пытаемся создать новый экземпляр
-    # (или переинициализировать). Иначе используем global tool.
+    # Инструмент нужного языка (создаётся при первом обращении, один на
+    # процесс). Если язык не удалось инициализировать — fallback на
+    # DEFAULT_LANGUAGE.
+    local_tool = None
+    tool_language = DEFAULT_LANGUAGE
     if language_code and language_code != DEFAULT_LANGUAGE:
-        logger.debug(
-            "Инициализируем LanguageTool для языка: %s", language_code)
         try:
-            local_tool = language_tool_python.LanguageTool(language_code)
+            local_tool = get_tool(language_code)
+            tool_language = language_code
         except Exception as e:
             logger.exception(
                 "Не удалось инициализировать LanguageTool для %s", language_code)
-            # fallback - глобальный tool
-            local_tool = tool
             warnings.append(
                 f"Fail init LanguageTool for {language_code}, fallback to {DEFAULT_LANGUAGE}")
-    else:
-        local_tool = tool
 
-    # Игнорируемые правила
-    if ignore_rules:
-        disable_rules(local_tool, ignore_rules)
+    if local_tool is None:
+        try:
+            local_tool = get_tool(DEFAULT_LANGUAGE)
+        except Exception as e:
+            # LanguageTool не поднялся (нет Java, сервер недоступен и т.п.) —
+            # возвращаем предупреждение; при следующем вызове попробуем снова
+            logger.warning(
+                "LanguageTool недоступен (%s). Проверка не выполнена.", e)
+            return {
+                "found_issues": found_issues,
+                "warnings": ["LanguageTool not initialized"],
+                "corrected_text": corrected_text
+            }
 
-    # Персональный словарь
-    if personal_dict:
-        add_personal_dictionary(local_tool, personal_dict)
+    # Игнорируемые правила и персональный словарь действуют только на этот
+    # запрос: правила уходят параметром disabledRules (check_with), а ошибки
+    # в словах из personal_dict отбрасываются из результата. Общий инструмент
+    # не меняется, и состояние не накапливается между запросами.
+    allowed_words = frozenset(
+        w.strip() for w in personal_dict or () if w.strip())
 
     # Выполняем проверку
     try:
-        matches = local_tool.check(text)
+        matches = _check(local_tool, tool_language, text, ignore_rules)
+        if allowed_words:
+            matches = tuple(m for m in matches
+                            if not _is_whitelisted(m, allowed_words))
         for m in matches:
             found_issues.append({
                 "offset": m.offset,
                 "error_text": m.matchedText,
-                "suggestions": m.replacements
+                "suggestions": list(m.replacements)
             })
 
         if auto_correct:
-            from language_tool_python.utils import correct
             try:
-                corrected_text = correct(text, matches)
+                # correct() сдвигает match.offset — работаем с копией,
+                # чтобы не испортить закэшированные Match
+                corrected_text = correct(text, copy.deepcopy(list(matches)))
             except Exception as e:
                 logger.warning("Автокоррекция не удалась: %s", e)
                 warnings.append(f"Auto-correct failed: {e}")
@@ -193,10 +245,6 @@ def run_spell_check(
         logger.exception("Ошибка при выполнении LanguageTool check: %s", e)
         warnings.append(str(e))
 
-    # Восстанавливаем настройки инструмента (отключённые правила, словари),
-    # если нужно «чистить» после разовой проверки. В данном примере не очищаем —
-    # пусть остаётся.
-
     logger.debug("run_spell_check completed: found_issues=%d, auto_correct=%s", len(
         found_issues), auto_correct)
     return {
@@ -207,7 +255,7 @@ def run_spell_check(
 
 
 # ------------------------------------------------------------------------------
-# 5. Примеры использования (локальные тесты)
+# 4. Примеры использования (локальные тесты)
 # ------------------------------------------------------------------------------
 if __name__ == "__main__":
     # Пример: локальный тест модуля
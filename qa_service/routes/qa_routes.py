@@ -15,20 +15,25 @@ qa_service/routes/qa_routers.py
 """
 
 import logging
-import re
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
-from flask import Blueprint, jsonify, request
+import orjson
+from pydantic import ValidationError
+from flask import Blueprint, Response, request, stream_with_context
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from flasgger import swag_from
 from flask_cors import CORS
 
 # Импортируем нужные функции и модели
-from db.db import SessionLocal
+from db.db import session_scope
 from db.repository import (
     create_qa_check, update_qa_check_fields, get_qa_check_by_id,
-    list_qa_checks, create_qa_comment, list_comments_for_check
+    get_qa_check_with_comments, list_qa_check_rows, iter_qa_checks,
+    create_qa_comment
 )
 from db.models import QACheckStatus
+from db.schemas import CheckTextRequest
 from config.settings import get_settings
 from logic.qa_manager import perform_qa_check
 from logic.spell_checker import run_spell_check  # если нужно напрямую
@@ -36,25 +41,107 @@ from logic.restricted_words_checker import filter_bad_words  # если нужн
 
 logger = logging.getLogger(__name__)
 
+# Настройки читаются один раз (get_settings() кэширован и валидирует окружение
+# при импорте config.settings); в обработчиках — только готовые значения
+MAX_BODY_BYTES = get_settings().QA_SERVICE_MAX_BODY_BYTES
+
 # Создаём Blueprint
 qa_bp = Blueprint("qa_bp", __name__)
 CORS(qa_bp)  # Если нужны CORS-заголовки для всех роутов этого блупринта
 
-# Вспомогательная функция для получения db-сессии
+# ------------------------------------------------------------------------------
+# JSON через orjson (вместо jsonify / request.get_json на stdlib json)
+# ------------------------------------------------------------------------------
+
+
+# datetime сериализуется самим orjson в ISO 8601; «наивные» метки (SQLite
+# отдаёт их без tzinfo) считаются UTC, UTC пишется как "Z". Эндпоинты отдают
+# datetime как есть (без isoformat()/str()), чтобы формат меток был один
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def orjson_response(obj: Any, status: int = 200) -> Response:
+    """JSON-ответ, сериализованный orjson (в разы быстрее jsonify на больших found_issues)."""
+    return Response(
+        orjson.dumps(obj, option=_ORJSON_OPTS),
+        status=status,
+        mimetype="application/json"
+    )
 
 
-def get_db_session():
-    db = SessionLocal()
+def _read_body() -> bytes:
+    """
+    Сырое тело запроса не больше MAX_BODY_BYTES, иначе RequestEntityTooLarge
+    (-> JSON 413 в handle_exception). Blueprint не полагается на
+    MAX_CONTENT_LENGTH приложения, поэтому лимит ставится на сам запрос: тело
+    без Content-Length (chunked) читается не дальше лимита.
+    """
+    # +1 байт: Werkzeug молча обрезает поток на лимите, и только так видно,
+    # что тело было длиннее
+    request.max_content_length = MAX_BODY_BYTES + 1
+    raw = request.get_data(cache=False)
+    if len(raw) > MAX_BODY_BYTES:
+        raise RequestEntityTooLarge()
+    return raw
+
+
+def _parse_json_body() -> Optional[Dict[str, Any]]:
+    """
+    Тело запроса, разобранное orjson. Пустое тело -> {}.
+    Возвращает None, если тело — не JSON-объект (тогда отвечаем 400).
+    """
+    raw = _read_body()
+    if not raw:
+        return {}
     try:
-        yield db
-    finally:
-        db.close()
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _bad_json_response() -> Response:
+    return orjson_response(
+        {"status": "error", "message": "Invalid JSON body"}, 400)
+
+
+@qa_bp.errorhandler(Exception)
+def handle_exception(e):
+    """Непредвиденные исключения эндпоинтов qa_bp — тоже JSON через orjson."""
+    if isinstance(e, HTTPException):
+        return orjson_response(
+            {"status": "error", "message": e.description}, e.code)
+    logger.exception("Непредвиденная ошибка в qa_bp: %s", e)
+    return orjson_response({"status": "error", "message": str(e)}, 500)
+
+
+# Сессия БД на время запроса: with get_db_session() as db_session: ...
+# Контекстный менеджер (а не генератор + next()) гарантирует rollback при
+# исключении и close() при любом выходе, без ручного finally в каждом обработчике.
+get_db_session = session_scope
 
 # ------------------------------------------------------------------------------
 # Примеры эндпоинтов
 # ------------------------------------------------------------------------------
 
 
+# Ответы /health и /info не меняются за время жизни процесса (настройки
+# frozen): JSON кодируется один раз, а не на каждый вызов liveness-пробы.
+_HEALTH_BLOB = orjson.dumps({"status": "OK", "service": "qa_service"})
+
+
+@lru_cache(maxsize=1)
+def _info_blob() -> bytes:
+    """JSON для /info (собирается при первом запросе, когда настройки уже загружены)."""
+    settings = get_settings()
+    return orjson.dumps({
+        "service_name": "qa_service",
+        "language_code": settings.QA_SERVICE_LANG,
+        "auto_correct_enabled": settings.QA_SERVICE_AUTO_CORRECT,
+        "bad_words_count": len(settings.bad_words_list)
+    })
+
+
 @qa_bp.route("/health", methods=["GET"])
 def health_check():
     """
@@ -69,7 +156,7 @@ def health_check():
           application/json:
             {"status": "OK", "service": "qa_service"}
     """
-    return jsonify({"status": "OK", "service": "qa_service"}), 200
+    return Response(_HEALTH_BLOB, status=200, mimetype="application/json")
 
 
 @qa_bp.route("/info", methods=["GET"])
@@ -83,14 +170,7 @@ def info():
       200:
         description: Информация о сервисе
     """
-    settings = get_settings()
-    info_data = {
-        "service_name": "qa_service",
-        "language_code": settings.QA_SERVICE_LANG,
-        "auto_correct_enabled": settings.QA_SERVICE_AUTO_CORRECT,
-        "bad_words_count": len(settings.bad_words_list)
-    }
-    return jsonify(info_data), 200
+    return Response(_info_blob(), status=200, mimetype="application/json")
 
 
 @qa_bp.route("/check-text", methods=["POST"])
@@ -140,6 +220,12 @@ def info():
                 }
             }
         },
+        400: {
+            "description": "Некорректное тело запроса"
+        },
+        413: {
+            "description": "Тело запроса больше QA_SERVICE_MAX_BODY_BYTES"
+        },
         500: {
             "description": "Ошибка при обработке"
         }
@@ -148,6 +234,8 @@ def info():
 def check_text():
     """
     Эндпоинт для запуска полной QA-проверки текста.
+    Тело разбирается в CheckTextRequest (db/schemas.py); неверные типы -> 400,
+    тело больше QA_SERVICE_MAX_BODY_BYTES -> 413.
     Принимает JSON-поля (все опциональны, кроме text):
       - text (str)
       - auto_correct (bool)
@@ -161,85 +249,108 @@ def check_text():
       - ignore_spelling_rules (List[str])
       - personal_dict (List[str])
     """
-    data = request.get_json() or {}
-
-    text = data.get("text", "")
-    auto_correct = bool(data.get("auto_correct", False))
-    add_log_comment = bool(data.get("add_log_comment", True))
-    store_positions = bool(data.get("store_positions", False))
-    store_positions_in_warnings = bool(
-        data.get("store_positions_in_warnings", False))
-
-    restricted_file_path = data.get("restricted_file_path", "")
-    restricted_fuzzy = bool(data.get("restricted_fuzzy", False))
-    restricted_placeholder = data.get("restricted_placeholder", "***")
-
-    language_code = data.get("language_code", None)  # e.g. "ru", "en-US"
-    ignore_spelling_rules = data.get("ignore_spelling_rules", None)
-    personal_dict = data.get("personal_dict", None)
+    # Заведомо большое тело отклоняем по Content-Length, не читая его
+    if request.content_length and request.content_length > MAX_BODY_BYTES:
+        return orjson_response(
+            {"status": "error",
+             "message": f"Request body too large: > {MAX_BODY_BYTES} bytes"}, 413)
 
-    db_session = next(get_db_session())
+    raw = _read_body()
     try:
-        result = perform_qa_check(
-            db=db_session,
-            text=text,
-            auto_correct=auto_correct,
-            add_log_comment=add_log_comment,
-            store_positions=store_positions,
-            store_positions_in_warnings=store_positions_in_warnings,
-            restricted_file_path=restricted_file_path,
-            restricted_fuzzy=restricted_fuzzy,
-            restricted_placeholder=restricted_placeholder,
-            language_code=language_code,
-            ignore_spelling_rules=ignore_spelling_rules,
-            personal_dict=personal_dict
-        )
-        status_code = 200 if result["status"] == "ok" else 500
-        return jsonify(result), status_code
+        req = (CheckTextRequest.model_validate_json(raw) if raw
+               else CheckTextRequest())
+    except ValidationError as e:
+        return orjson_response(
+            {"status": "error", "message": "Invalid request body",
+             "errors": e.errors(include_url=False, include_context=False,
+                                include_input=False)}, 400)
+
+    # Обработчик синхронный: в gevent-воркере (gunicorn.conf.py) ожидание
+    # LanguageTool и PostgreSQL (psycogreen) уступает управление другим
+    # запросам. Соединение с БД на время проверки не удерживается: после
+    # COMMIT записи PENDING сессия (expire_on_commit=False) возвращает его в пул.
+    try:
+        with get_db_session() as db_session:
+            result = perform_qa_check(db=db_session, **req.model_dump())
+            status_code = 200 if result["status"] == "ok" else 500
+            return orjson_response(result, status_code)
 
     except Exception as e:
         logger.exception("Ошибка при /check-text: %s", e)
-        return jsonify({"status": "error", "message": str(e)}), 500
-    finally:
-        db_session.close()
+        return orjson_response({"status": "error", "message": str(e)}, 500)
+
+
+# Верхняя граница ?limit= для /checks
+MAX_CHECKS_LIMIT = 10_000
+
+
+def _check_to_dict(ch) -> Dict[str, Any]:
+    """QACheck -> dict для NDJSON-потока /checks (datetime сериализует orjson)."""
+    return {
+        "id": ch.id,
+        "original_text": ch.original_text,
+        "filtered_text": ch.filtered_text,
+        "found_issues": ch.found_issues,
+        "corrected_text": ch.corrected_text,
+        "warnings": ch.warnings,
+        "status": ch.status,
+        "created_at": ch.created_at,
+        "updated_at": ch.updated_at,
+    }
 
 
 @qa_bp.route("/checks", methods=["GET"])
 def get_all_qa_checks():
     """
-    Возвращает список (limit=50) последних QACheck.
+    Возвращает список (limit=50, не больше MAX_CHECKS_LIMIT) последних QACheck.
+    С ?stream=1 — потоком NDJSON (application/x-ndjson), по записи на строку.
     ---
     tags:
       - Check
+    parameters:
+      - name: stream
+        in: query
+        type: integer
+        required: False
     responses:
       200:
         description: Список проверок
+      400:
+        description: Некорректные limit/offset
     """
-    limit = int(request.args.get("limit", 50))
-    offset = int(request.args.get("offset", 0))
+    try:
+        limit = min(int(request.args.get("limit", 50)), MAX_CHECKS_LIMIT)
+        offset = int(request.args.get("offset", 0))
+        after_id = request.args.get("after_id", type=int)
+    except ValueError:
+        return orjson_response(
+            {"status": "error", "message": "limit/offset must be integers"}, 400)
+    # Отрицательные значения PostgreSQL отвергает уже при выполнении запроса:
+    # 500 в списке и оборванный 200 в потоке — отсекаем их здесь
+    if limit < 0 or offset < 0:
+        return orjson_response(
+            {"status": "error", "message": "limit/offset must be non-negative"}, 400)
+
+    if request.args.get("stream") in ("1", "true"):
+        # NDJSON: по строке JSON на запись, строки читаются серверным курсором
+        # (iter_qa_checks) и отдаются клиенту сразу, без списка в памяти
+        @stream_with_context
+        def generate():
+            with get_db_session() as db_session:
+                for ch in iter_qa_checks(
+                        db_session, limit=limit, offset=offset, after_id=after_id):
+                    yield orjson.dumps(_check_to_dict(ch), option=_ORJSON_OPTS) + b"\n"
+        return Response(generate(), mimetype="application/x-ndjson")
 
-    db_session = next(get_db_session())
     try:
-        checks = list_qa_checks(db_session, limit=limit, offset=offset)
-        result = []
-        for ch in checks:
-            result.append({
-                "id": ch.id,
-                "original_text": ch.original_text,
-                "filtered_text": ch.filtered_text,
-                "found_issues": ch.found_issues,
-                "corrected_text": ch.corrected_text,
-                "warnings": ch.warnings,
-                "status": ch.status.value,
-                "created_at": str(ch.created_at),
-                "updated_at": str(ch.updated_at),
-            })
-        return jsonify(result), 200
+        with get_db_session() as db_session:
+            # Строки qa_checks уже словарями (Core, без ORM-объектов)
+            rows = list_qa_check_rows(
+                db_session, limit=limit, offset=offset, after_id=after_id)
+            return orjson_response(rows, 200)
     except Exception as e:
         logger.exception("Ошибка при get_all_qa_checks: %s", e)
-        return jsonify({"status": "error", "message": str(e)}), 500
-    finally:
-        db_session.close()
+        return orjson_response({"status": "error", "message": str(e)}, 500)
 
 
 @qa_bp.route("/checks/<int:check_id>", methods=["GET"])
@@ -260,37 +371,34 @@ def get_qa_check_details(check_id: int):
       404:
         description: Не найдено
     """
-    db_session = next(get_db_session())
     try:
-        check_obj = get_qa_check_by_id(db_session, check_id)
-        if not check_obj:
-            return jsonify({"status": "error", "message": "Not found"}), 404
-
-        comments = list_comments_for_check(db_session, check_id)
-        response = {
-            "id": check_obj.id,
-            "original_text": check_obj.original_text,
-            "filtered_text": check_obj.filtered_text,
-            "found_issues": check_obj.found_issues,
-            "corrected_text": check_obj.corrected_text,
-            "warnings": check_obj.warnings,
-            "status": check_obj.status.value,
-            "created_at": str(check_obj.created_at),
-            "updated_at": str(check_obj.updated_at),
-            "comments": [
-                {
-                    "id": c.id,
-                    "comment_text": c.comment_text,
-                    "created_at": str(c.created_at)
-                } for c in comments
-            ]
-        }
-        return jsonify(response), 200
+        with get_db_session() as db_session:
+            check_obj = get_qa_check_with_comments(db_session, check_id)
+            if not check_obj:
+                return orjson_response({"status": "error", "message": "Not found"}, 404)
+
+            response = {
+                "id": check_obj.id,
+                "original_text": check_obj.original_text,
+                "filtered_text": check_obj.filtered_text,
+                "found_issues": check_obj.found_issues,
+                "corrected_text": check_obj.corrected_text,
+                "warnings": check_obj.warnings,
+                "status": check_obj.status,
+                "created_at": check_obj.created_at,
+                "updated_at": check_obj.updated_at,
+                "comments": [
+                    {
+                        "id": c.id,
+                        "comment_text": c.comment_text,
+                        "created_at": c.created_at
+                    } for c in check_obj.comments
+                ]
+            }
+            return orjson_response(response, 200)
     except Exception as e:
         logger.exception("Ошибка при get_qa_check_details: %s", e)
-        return jsonify({"status": "error", "message": str(e)}), 500
-    finally:
-        db_session.close()
+        return orjson_response({"status": "error", "message": str(e)}, 500)
 
 
 @qa_bp.route("/checks/<int:check_id>/comments", methods=["POST"])
@@ -322,27 +430,27 @@ def add_comment_to_check(check_id: int):
       500:
         description: Ошибка при создании
     """
-    data = request.get_json() or {}
+    data = _parse_json_body()
+    if data is None:
+        return _bad_json_response()
     comment_text = data.get("comment_text", "")
 
-    db_session = next(get_db_session())
     try:
-        check_obj = get_qa_check_by_id(db_session, check_id)
-        if not check_obj:
-            return jsonify({"status": "error", "message": "QACheck not found"}), 404
-
-        comment = create_qa_comment(db_session, check_id, comment_text)
-        if not comment:
-            return jsonify({"status": "error", "message": "Create comment failed"}), 500
-
-        resp = {
-            "id": comment.id,
-            "comment_text": comment.comment_text,
-            "created_at": str(comment.created_at)
-        }
-        return jsonify(resp), 200
+        with get_db_session() as db_session:
+            check_obj = get_qa_check_by_id(db_session, check_id)
+            if not check_obj:
+                return orjson_response({"status": "error", "message": "QACheck not found"}, 404)
+
+            comment = create_qa_comment(db_session, check_id, comment_text)
+            if not comment:
+                return orjson_response({"status": "error", "message": "Create comment failed"}, 500)
+
+            resp = {
+                "id": comment.id,
+                "comment_text": comment.comment_text,
+                "created_at": comment.created_at
+            }
+            return orjson_response(resp, 200)
     except Exception as e:
         logger.exception("Ошибка при add_comment_to_check: %s", e)
-        return jsonify({"status": "error", "message": str(e)}), 500
-    finally:
-        db_session.close()
+        return orjson_response({"status": "error", "message": str(e)}, 500)
@@ -10,6 +10,12 @@ qa_service/services/language_tool_client.py
  - Персональный словарь (add_to_dict).
  - Возможность хранить "persistent" набор правил, которые всегда отключены,
    и "persistent" словарь слов, которые всегда считаются допустимыми.
+ - create_language_tool(): подключение к отдельному LanguageTool-серверу
+   (QA_LT_REMOTE_URL) через общий keep-alive пул HTTP-соединений.
+ - Инструменты LanguageToolClient переиспользуются по коду языка (_TOOL_POOL):
+   один на язык на процесс, общий для всех клиентов. Правила и словарь
+   клиента хранятся в самом клиенте и передаются с каждой проверкой
+   (check_with), поэтому общий инструмент не меняется.
 
 Пример использования:
     client = LanguageToolClient(language_code="ru")
@@ -31,13 +37,214 @@ qa_service/services/language_tool_client.py
 
 """
 
+import atexit
+import copy
+import functools
+import hashlib
+import http.client
+import json
 import logging
-from typing import List, Dict, Any, Optional
-
+import re
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import FrozenSet, Iterable, List, Dict, Any, Optional, Set, Tuple
+
+import requests
+from cachetools import LRUCache
+from requests.adapters import HTTPAdapter
 import language_tool_python
+from language_tool_python.match import Match
+from language_tool_python.utils import LanguageToolError, correct
+
+from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# ------------------------------------------------------------------------------
+# ОБЩИЙ HTTP-ПУЛ К LANGUAGETOOL-СЕРВЕРУ
+# ------------------------------------------------------------------------------
+# language_tool_python делает requests.get(...) на каждый check(), т.е. новое
+# TCP-соединение на каждый запрос. Здесь — один keep-alive пул на процесс.
+# В gevent-воркере проверки из разных greenlet'ов идут на сервер параллельно,
+# поэтому пул должен вмещать все одновременные запросы: соединения сверх
+# pool_maxsize закрываются после ответа и keep-alive для них теряется.
+LT_POOL_CONNECTIONS = 10
+LT_POOL_MAXSIZE = get_settings().QA_LT_POOL_MAXSIZE
+
+_lt_session = requests.Session()
+_lt_adapter = HTTPAdapter(
+    pool_connections=LT_POOL_CONNECTIONS,
+    pool_maxsize=LT_POOL_MAXSIZE,
+    max_retries=0,
+)
+_lt_session.mount("http://", _lt_adapter)
+_lt_session.mount("https://", _lt_adapter)
+
+
+class PooledLanguageTool(language_tool_python.LanguageTool):
+    """
+    LanguageTool, который ходит на сервер через общий requests.Session (_lt_session).
+    Запросы с параметрами (check) отправляются POST-ом: текст в теле, а не в URL.
+    """
+
+    def _query_server(self, url, params=None, num_tries=2):
+        for n in range(num_tries):
+            try:
+                if params is None:
+                    response = _lt_session.get(url, timeout=self._TIMEOUT)
+                else:
+                    response = _lt_session.post(
+                        url, data=params, timeout=self._TIMEOUT)
+                with response:
+                    try:
+                        return response.json()
+                    except json.decoder.JSONDecodeError:
+                        raise LanguageToolError(response.content.decode())
+            except (IOError, http.client.HTTPException) as e:
+                if self._remote is False:
+                    self._terminate_server()
+                    self._start_local_server()
+                if n + 1 >= num_tries:
+                    raise LanguageToolError("{}: {}".format(self._url, e))
+
+    def check_with(
+        self,
+        text: str,
+        disabled_rules: Optional[Iterable[str]] = None
+    ) -> List[Match]:
+        """
+        check(text) с дополнительными правилами, отключёнными только для
+        этого запроса (параметр disabledRules /v2/check). Состояние инструмента
+        (self.disabled_rules) не меняется, поэтому один экземпляр безопасно
+        делить между запросами и потоками.
+        """
+        params = self._create_params(text)
+        if disabled_rules:
+            params["disabledRules"] = ",".join(
+                sorted(set(self.disabled_rules).union(disabled_rules)))
+        url = urllib.parse.urljoin(self._url, "check")
+        response = self._query_server(url, params)
+        return [Match(match) for match in response["matches"]]
+
+
+# server.properties для локального сервера: кэш результатов по предложениям
+# и кэш конвейеров правил. Удалённому серверу конфиг передать нельзя — там он
+# задаётся в самом сервере (см. сервис languagetool в docker-compose.yml).
+LT_LOCAL_SERVER_CONFIG = {
+    "cacheSize": 10000,
+    "pipelineCaching": "true",
+}
+
+
+def create_language_tool(language_code: str) -> language_tool_python.LanguageTool:
+    """
+    Создаёт LanguageTool для language_code.
+    Если задан QA_LT_REMOTE_URL, подключается к отдельному долгоживущему серверу
+    (без собственной JVM в процессе), иначе поднимает локальный сервер, как раньше
+    (с LT_LOCAL_SERVER_CONFIG).
+    """
+    remote_url = get_settings().QA_LT_REMOTE_URL
+    if remote_url:
+        logger.debug("LanguageTool (lang=%s) -> remote %s",
+                     language_code, remote_url)
+        return PooledLanguageTool(language_code, remote_server=remote_url)
+    return PooledLanguageTool(language_code, config=LT_LOCAL_SERVER_CONFIG)
+
+
+# ------------------------------------------------------------------------------
+# ПУЛ ИНСТРУМЕНТОВ LanguageToolClient ПО ЯЗЫКАМ
+# ------------------------------------------------------------------------------
+# Создание LanguageTool (запуск/подключение к серверу) стоит сотни мс, поэтому
+# инструмент создаётся один раз на язык и процесс; set_language лишь
+# переключает ссылку. Инструмент общий для всех клиентов этого языка
+# (и потоков/greenlet'ов), поэтому клиенты его состояние не меняют.
+_TOOL_POOL: Dict[str, language_tool_python.LanguageTool] = {}
+_POOL_LOCK = threading.RLock()
+
+
+def _close_tool_pool() -> None:
+    """Закрывает инструменты пула (останавливает локальные JVM) при выходе."""
+    with _POOL_LOCK:
+        for tool in list(_TOOL_POOL.values()):
+            try:
+                tool.close()
+            except Exception as e:
+                logger.warning("Не удалось закрыть LanguageTool: %s", e)
+        _TOOL_POOL.clear()
+
+
+atexit.register(_close_tool_pool)
+
+# ------------------------------------------------------------------------------
+# КЭШ РЕЗУЛЬТАТОВ check_text
+# ------------------------------------------------------------------------------
+# Повторная проверка того же текста с теми же правилами/словарём (частый
+# случай — перепроверка после правок) обходится без запроса к LanguageTool.
+# Общий для всех клиентов, как и _TOOL_POOL.
+LT_RESULT_CACHE_SIZE = 4096
+_LT_RESULT_CACHE: LRUCache = LRUCache(maxsize=LT_RESULT_CACHE_SIZE)
+_lt_result_lock = threading.Lock()
+
+
+def clear_lt_result_cache() -> None:
+    """Сбрасывает кэш результатов LanguageToolClient.check_text."""
+    with _lt_result_lock:
+        _LT_RESULT_CACHE.clear()
+
+
+# ------------------------------------------------------------------------------
+# ПРОВЕРКА БОЛЬШИХ ТЕКСТОВ ЧАСТЯМИ
+# ------------------------------------------------------------------------------
+# Тексты длиннее LT_CHUNK_SIZE режутся на части и проверяются параллельно:
+# LanguageTool-сервер многопоточный, и время ответа на большой текст падает
+# почти пропорционально числу одновременных запросов.
+# Режем предпочтительно по границе абзаца — правила LanguageTool её не
+# пересекают, и результат тот же, что при проверке целиком. Если в окне нет
+# абзаца, режем по концу предложения (правила, смотрящие на соседнее
+# предложение, на этом стыке не сработают), и только затем по пробелу, чтобы
+# не разрезать слово и не получить ложную орфографическую ошибку.
+LT_CHUNK_SIZE = 8192
+LT_CHUNK_WORKERS = 4
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+_SENTENCE_BREAK_RE = re.compile(r"[.!?…]\s+|\n")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Хотя бы одно слово из двух и более букв. Без него (числа, даты, пробелы,
+# пунктуация) проверять LanguageTool-у нечего — запрос к серверу не нужен
+_WORDY_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+def _is_whitelisted(match: Match, allowed_words: FrozenSet[str]) -> bool:
+    """Орфографическая ошибка в слове из словаря клиента/запроса."""
+    return (match.ruleIssueType == "misspelling"
+            and match.matchedText in allowed_words)
+
+
+def _split_text(text: str, size: int = LT_CHUNK_SIZE) -> List[Tuple[int, str]]:
+    """
+    Делит text на части не длиннее size: [(смещение части в text, часть), ...].
+    Режет по последней границе абзаца в пределах size, иначе по концу
+    предложения, иначе по последнему пробелу; ровно по size — только если в
+    окне нет ни одного пробела.
+    """
+    chunks: List[Tuple[int, str]] = []
+    start = 0
+    while len(text) - start > size:
+        end = start + size
+        cut = None
+        for pattern in (_PARAGRAPH_BREAK_RE, _SENTENCE_BREAK_RE, _WHITESPACE_RE):
+            for m in pattern.finditer(text, start, end):
+                cut = m.end()
+            if cut is not None:
+                break
+        if cut is None or cut <= start:
+            cut = end
+        chunks.append((start, text[start:cut]))
+        start = cut
+    chunks.append((start, text[start:]))
+    return chunks
+
 
 class LanguageToolClient:
     """
@@ -46,8 +253,9 @@ class LanguageToolClient:
 
     Основные поля:
      - language_code: текущий код языка (например, "ru" или "en-US").
-     - persistent_disabled_rules: список правил, которые всегда отключены.
-     - persistent_dict_words: список слов, которые всегда считаются допустимыми.
+     - persistent_disabled_rules: множество правил, которые всегда отключены.
+     - persistent_dict_words: множество слов, которые всегда считаются допустимыми.
+     - _temp_disabled_rules: правила, отключённые disable_rules() до enable_rules().
      - _tool: объект LanguageTool (или None, если инициализация не удалась).
      - _initialized: флаг, говорящий, что _tool успешно инициализирован.
 
@@ -68,10 +276,13 @@ class LanguageToolClient:
         self._tool: Optional[language_tool_python.LanguageTool] = None
         self._initialized = False
 
-        # "Persistent" правила, которые будут всегда отключены
-        self.persistent_disabled_rules: List[str] = []
+        # "Persistent" правила, которые будут всегда отключены (set: проверка
+        # «уже есть?» за O(1) и для тысяч элементов)
+        self.persistent_disabled_rules: Set[str] = set()
         # "Persistent" слова, которые считаем корректными
-        self.persistent_dict_words: List[str] = []
+        self.persistent_dict_words: Set[str] = set()
+        # Правила, временно отключённые disable_rules()
+        self._temp_disabled_rules: Set[str] = set()
 
         if initialize:
             self.initialize_tool()
@@ -83,29 +294,39 @@ class LanguageToolClient:
         """
         Инициализирует self._tool, используя self.language_code.
         Если _tool уже инициализирован, ничего не делаем.
+
+        Инструмент берётся из _TOOL_POOL (создаётся create_language_tool при
+        первом запросе языка). Правила и словарь клиента к нему не
+        применяются: они передаются с каждой проверкой (см. check_text).
         """
         if self._initialized:
             logger.debug(
                 "LanguageTool уже инициализирован (lang=%s).", self.language_code)
             return
 
+        code = self.language_code
         try:
-            self._tool = language_tool_python.LanguageTool(self.language_code)
-            self._initialized = True
-            logger.info(
-                "LanguageToolClient инициализирован (lang=%s).", self.language_code)
-
-            # Применяем "persistent" правила и слова
-            self._apply_persistent_rules_and_dict()
+            with _POOL_LOCK:
+                tool = _TOOL_POOL.get(code)
+                if tool is None:
+                    # С QA_LT_REMOTE_URL — лишь HTTP-клиент к общему серверу
+                    # (одна JVM на все воркеры), иначе локальный сервер
+                    tool = create_language_tool(code)
+                    _TOOL_POOL[code] = tool
+                    logger.info(
+                        "LanguageToolClient инициализирован (lang=%s).", code)
+                self._tool = tool
+                self._initialized = True
 
         except Exception as e:
             logger.exception(
                 "Не удалось инициализировать LanguageTool (lang=%s): %s", self.language_code, e)
             self._tool = None
+            self._initialized = False
 
     def set_language(self, new_language_code: str) -> None:
         """
-        Меняет язык клиента и переинициализирует инструмент.
+        Меняет язык клиента и переключает инструмент (из _TOOL_POOL).
         Полезно, если нужно в рамках одного клиента переключиться с en-US на ru и т.д.
         """
         if new_language_code == self.language_code and self._initialized:
@@ -120,109 +341,60 @@ class LanguageToolClient:
         self._initialized = False
         self.initialize_tool()
 
-    def _apply_persistent_rules_and_dict(self) -> None:
-        """
-        Применяет "persistent_disabled_rules" и "persistent_dict_words"
-        к текущему self._tool. Вызывается после инициализации.
-        """
-        if not self._tool:
-            return
-        if self.persistent_disabled_rules:
-            existing = set(self._tool.disabled_rules)
-            new_set = existing | set(self.persistent_disabled_rules)
-            self._tool.disabled_rules = list(new_set)
-            logger.debug("Применили persistent_disabled_rules (%d)",
-                         len(self.persistent_disabled_rules))
-
-        if self.persistent_dict_words:
-            for w in self.persistent_dict_words:
-                if w.strip():
-                    self._tool.add_dictionary_word(w.strip())
-            logger.debug("Применили persistent_dict_words (%d)",
-                         len(self.persistent_dict_words))
-
     # --------------------------------------------------------------------------
     # ПЕРСИСТЕНТНЫЕ ОПЦИИ (ПРАВИЛА, СЛОВА)
     # --------------------------------------------------------------------------
     def disable_persistent_rules(self, rules: List[str]) -> None:
         """
-        Добавляет правила в общий (перманентно отключённый) список.
-        Если инструмент уже инициализирован, сразу применяет их.
+        Добавляет правила в общий (перманентно отключённый) список клиента.
+        Они отключаются в каждой следующей проверке check_text.
         """
-        newly_added = 0
-        for r in rules:
-            if r not in self.persistent_disabled_rules:
-                self.persistent_disabled_rules.append(r)
-                newly_added += 1
-
-        if newly_added > 0 and self._tool:
-            # Применяем
-            existing = set(self._tool.disabled_rules)
-            new_set = existing | set(rules)
-            self._tool.disabled_rules = list(new_set)
+        new = set(rules) - self.persistent_disabled_rules
+        self.persistent_disabled_rules |= new
+
+        if new:
             logger.debug("Добавили %d persistent-правил, всего в persistent=%d",
-                         newly_added, len(self.persistent_disabled_rules))
+                         len(new), len(self.persistent_disabled_rules))
 
     def enable_persistent_rules(self, rules: List[str]) -> None:
         """
-        Убирает правила из общего списка "persistent_disabled_rules".
-        Если инструмент уже инициализирован, возвращает их в включённое состояние.
+        Убирает правила из общего списка "persistent_disabled_rules":
+        следующие проверки выполняются уже с ними.
         """
-        removed = 0
-        for r in rules:
-            if r in self.persistent_disabled_rules:
-                self.persistent_disabled_rules.remove(r)
-                removed += 1
-
-        if removed > 0 and self._tool:
-            # Применяем
-            # Оставляем всё, что было, кроме возвращённых
-            current_disabled = set(self._tool.disabled_rules)
-            for r in rules:
-                if r in current_disabled:
-                    current_disabled.remove(r)
-            self._tool.disabled_rules = list(current_disabled)
+        removed = self.persistent_disabled_rules.intersection(rules)
+        self.persistent_disabled_rules -= removed
+
+        if removed:
             logger.debug("Убрали %d правил из persistent-списка, всего в persistent=%d",
-                         removed, len(self.persistent_disabled_rules))
+                         len(removed), len(self.persistent_disabled_rules))
 
     def reset_rules(self) -> None:
         """
-        Очищает persistent_disabled_rules (и, если инструмент инициализирован,
-        сбрасывает self._tool.disabled_rules в пустой список).
+        Очищает persistent_disabled_rules и временно отключённые правила
+        (disable_rules): следующие проверки идут со всеми правилами.
         """
         count = len(self.persistent_disabled_rules)
         self.persistent_disabled_rules.clear()
-
-        if self._tool:
-            self._tool.disabled_rules = []
+        self._temp_disabled_rules.clear()
         logger.debug(
             "reset_rules(): очищены все persistent-правила (было %d).", count)
 
     def add_to_persistent_dict(self, words: List[str]) -> None:
         """
-        Добавляет слова в общий persistent-словарь. Если инструмент инициализирован,
-        сразу применяет их (self._tool.add_dictionary_word).
+        Добавляет слова в общий persistent-словарь: орфографические ошибки в
+        этих словах отбрасываются из результатов check_text.
         """
-        newly_added = 0
-        for w in words:
-            w_stripped = w.strip()
-            if w_stripped and w_stripped not in self.persistent_dict_words:
-                self.persistent_dict_words.append(w_stripped)
-                newly_added += 1
-
-        if newly_added > 0 and self._tool:
-            for w in words:
-                w_stripped = w.strip()
-                if w_stripped:
-                    self._tool.add_dictionary_word(w_stripped)
+        new = {w.strip() for w in words if w.strip()} - self.persistent_dict_words
+        self.persistent_dict_words |= new
+
+        if new:
             logger.debug("add_to_persistent_dict: Добавили %d слов. Всего=%d",
-                         newly_added, len(self.persistent_dict_words))
+                         len(new), len(self.persistent_dict_words))
 
     def reset_persistent_dict(self) -> None:
         """
-        Очищает persistent_dict_words. Не может «удалить» слова из уже инициализированного
-        self._tool, т.к. библиотека language_tool_python не поддерживает remove_dictionary_word.
-        Но все новые проверки слов уже не будут добавляться.
+        Очищает persistent_dict_words: слова из него снова считаются ошибками
+        в следующих проверках.
         """
         count = len(self.persistent_dict_words)
         self.persistent_dict_words.clear()
@@ -234,38 +406,38 @@ class LanguageToolClient:
     # --------------------------------------------------------------------------
     def disable_rules(self, rules: List[str]) -> None:
         """
-        Отключает указанные правила ТОЛЬКО на текущее время (меняя self._tool.disabled_rules).
-        После следующего check_text, если вы сделаете reset или 
-        переинициализацию, они могут вернуться.  
+        Временно отключает указанные правила (для этого клиента) — до
+        enable_rules() или reset_rules().
         Если нужно отключить навсегда, используйте disable_persistent_rules.
         """
-        if not self._tool:
-            logger.warning(
-                "disable_rules: инструмент не инициализирован, пропускаем.")
-            return
-        current = set(self._tool.disabled_rules)
-        new = current | set(rules)
-        self._tool.disabled_rules = list(new)
+        self._temp_disabled_rules.update(rules)
         logger.debug("Временное отключение %d правил, всего %d сейчас.", len(
-            rules), len(self._tool.disabled_rules))
+            rules), len(self._temp_disabled_rules))
 
     def enable_rules(self, rules: List[str]) -> None:
         """
         Включает указанные правила обратно (если они были отключены только временно).
         Если они были в persistent_disabled_rules, их нужно убирать там отдельно.
         """
-        if not self._tool:
-            logger.warning(
-                "enable_rules: инструмент не инициализирован, пропускаем.")
-            return
-        current = set(self._tool.disabled_rules)
-        removed = 0
-        for r in rules:
-            if r in current:
-                current.remove(r)
-                removed += 1
-        self._tool.disabled_rules = list(current)
-        logger.debug("enable_rules(): убрали %d правил из disabled.", removed)
+        removed = self._temp_disabled_rules.intersection(rules)
+        self._temp_disabled_rules -= removed
+        logger.debug("enable_rules(): убрали %d правил из disabled.", len(removed))
+
+    def _rules_for_call(
+        self,
+        ignore_rules: Optional[Iterable[str]] = None
+    ) -> FrozenSet[str]:
+        """Правила, отключаемые в проверке: persistent + временные + ignore_rules."""
+        return frozenset(self.persistent_disabled_rules.union(
+            self._temp_disabled_rules, ignore_rules or ()))
+
+    def _words_for_call(
+        self,
+        personal_dict: Optional[Iterable[str]] = None
+    ) -> FrozenSet[str]:
+        """Допустимые слова проверки: persistent-словарь + personal_dict."""
+        return frozenset(self.persistent_dict_words.union(
+            w.strip() for w in personal_dict or () if w.strip()))
 
     # --------------------------------------------------------------------------
     # МЕТОДЫ ПРОВЕРКИ И АВТОКОРРЕКЦИИ
@@ -279,6 +451,8 @@ class LanguageToolClient:
     ) -> Dict[str, Any]:
         """
         Проверка текста через LanguageTool (self._tool).
+        Результаты без предупреждений кэшируются (_LT_RESULT_CACHE) по языку,
+        хэшу текста, auto_correct и итоговым правилам и словарю проверки.
 
         :param text: Исходный текст
         :param auto_correct: True => делаем автокоррекцию
@@ -296,6 +470,13 @@ class LanguageToolClient:
         found_issues = []
         corrected_text = None
 
+        if not _WORDY_RE.search(text):
+            return {
+                "found_issues": found_issues,
+                "warnings": warnings,
+                "corrected_text": text if auto_correct else None
+            }
+
         if not self._initialized or not self._tool:
             logger.warning(
                 "LanguageToolClient: инструмент не инициализирован.")
@@ -305,36 +486,44 @@ class LanguageToolClient:
                 "corrected_text": None
             }
 
-        # Сохраним текущий список disabled_rules, потом вернём
-        original_rules = list(self._tool.disabled_rules)
+        # Правила и словарь действуют только на эту проверку: правила уходят
+        # параметром disabledRules (check_with), а ошибки в допустимых словах
+        # отбрасываются из результата. Общий инструмент не меняется
+        disabled_rules = self._rules_for_call(ignore_rules)
+        allowed_words = self._words_for_call(personal_dict)
+
+        # Ключ — ровно те правила, с которыми уйдёт запрос (check_with
+        # добавляет к ним disabled_rules самого инструмента), и тот же словарь
+        cache_key = (
+            self.language_code,
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+            auto_correct,
+            frozenset(self._tool.disabled_rules).union(disabled_rules),
+            allowed_words,
+        )
+        with _lt_result_lock:
+            cached = _LT_RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
 
         try:
-            # Если есть ignore_rules, отключим их на время
-            if ignore_rules:
-                self.disable_rules(ignore_rules)
-
-            # Если есть personal_dict, добавим его (без возврата)
-            tmp_added_words = []
-            if personal_dict:
-                for w in personal_dict:
-                    w_s = w.strip()
-                    if w_s:
-                        self._tool.add_dictionary_word(w_s)
-                        tmp_added_words.append(w_s)
-
-            # Запускаем проверку
-            matches = self._tool.check(text)
-
-            for m in matches:
-                found_issues.append({
+            # Запускаем проверку (большие тексты — частями параллельно)
+            matches = self._check_matches(text, disabled_rules)
+            if allowed_words:
+                matches = [m for m in matches
+                           if not _is_whitelisted(m, allowed_words)]
+
+            found_issues = [
+                {
                     "offset": m.offset,
                     "error_text": m.matchedText,
                     "suggestions": m.replacements
-                })
+                }
+                for m in matches
+            ]
 
             # Если автокоррекция
             if auto_correct:
-                from language_tool_python.utils import correct
                 try:
                     corrected_text = correct(text, matches)
                 except Exception as e:
@@ -345,19 +534,45 @@ class LanguageToolClient:
             logger.exception("Ошибка check_text: %s", e)
             warnings.append(str(e))
 
-        finally:
-            # Вернём disabled_rules в исходное состояние
-            self._tool.disabled_rules = original_rules
-
-            # personal_dict: language_tool_python нет метода удалять слова,
-            # так что "tmp_added_words" остаются, но это «временная» особенность.
-            # Чтобы «откатить», нужно переинициализировать инструмент заново.
-
-        return {
+        result = {
             "found_issues": found_issues,
             "warnings": warnings,
             "corrected_text": corrected_text
         }
+        # Результаты с предупреждениями (ошибка LT, сбой автокоррекции) не
+        # кэшируем: следующий вызов должен попробовать снова
+        if not warnings:
+            with _lt_result_lock:
+                _LT_RESULT_CACHE[cache_key] = copy.deepcopy(result)
+        return result
+
+    def _check_matches(
+        self,
+        text: str,
+        disabled_rules: Optional[Iterable[str]] = None
+    ) -> List[Match]:
+        """
+        self._tool.check_with(text, disabled_rules); текст длиннее
+        LT_CHUNK_SIZE проверяется частями (_split_text) до LT_CHUNK_WORKERS
+        одновременно, смещения совпадений переводятся в позиции исходного текста.
+        """
+        check = functools.partial(
+            self._tool.check_with, disabled_rules=disabled_rules)
+        if len(text) <= LT_CHUNK_SIZE:
+            return check(text)
+
+        chunks = _split_text(text, LT_CHUNK_SIZE)
+        with ThreadPoolExecutor(
+                max_workers=min(LT_CHUNK_WORKERS, len(chunks))) as executor:
+            chunk_matches = list(executor.map(
+                check, [chunk for _start, chunk in chunks]))
+
+        matches: List[Match] = []
+        for (chunk_start, _chunk), part in zip(chunks, chunk_matches):
+            for m in part:
+                m.offset += chunk_start
+            matches.extend(part)
+        return matches
 
     def correct_text(
         self,
@@ -369,7 +584,8 @@ class LanguageToolClient:
         можно вручную вызвать автокоррекцию.
 
         :param text: исходный текст
-        :param matches: список Match. Если None, заново делаем self._tool.check(text).
+        :param matches: список Match. Если None, текст проверяется заново
+                        (с persistent- и временными правилами клиента).
         :return: скорректированный текст
         """
         if not self._initialized or not self._tool:
@@ -378,9 +594,10 @@ class LanguageToolClient:
             return text
 
         if matches is None:
-            matches = self._tool.check(text)
+            allowed_words = self._words_for_call()
+            matches = [m for m in self._check_matches(text, self._rules_for_call())
+                       if not _is_whitelisted(m, allowed_words)]
 
-        from language_tool_python.utils import correct
         try:
             return correct(text, matches)
         except Exception as e:
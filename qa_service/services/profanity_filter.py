@@ -4,10 +4,15 @@ qa_service/services/profanity_filter.py
 Клиент/модуль для фильтрации «плохих» (нецензурных) слов в тексте.
 
 Возможности:
- - Загрузка «плохих» слов из ENV (Pydantic-настроек) + из файла (опционально)
+ - Загрузка «плохих» слов из ENV (Pydantic-настроек) + из файла (опционально);
+   загруженные слова кэшируются, файл перечитывается только при изменении mtime
+   (для тестов — clear_words_cache())
  - "Fuzzy" режим (подстрочная замена) или строгий (\bслово\b)
  - Возврат позиций замен
- - «persistent» настройки внутри класса (placeholder, fuzzy, file_path)
+ - «persistent» настройки внутри класса (placeholder, fuzzy, file_path);
+   слова собираются в одно выражение при load_words() (compile_bad_words_pattern
+   из logic/restricted_words_checker.py: автомат Ахо-Корасик при установленном
+   pyahocorasick), и текст сканируется один раз, а не по разу на слово
  - Быстрые статические функции (filter_text_once, detect_words_once), если нужна процедура без сохранения state.
 
 Пример:
@@ -28,11 +33,18 @@ qa_service/services/profanity_filter.py
 """
 
 import os
-import re
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+import threading
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Tuple, Dict, Any, Optional
+
+from cachetools import LRUCache
 
 from config.settings import get_settings
+from logic.restricted_words_checker import (
+    compile_bad_words_pattern, detect_bad_words, replace_bad_words,
+    replace_bad_words_positions
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,49 +53,128 @@ logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------
 
 
-def load_words_from_env() -> List[str]:
+def load_words_from_env() -> Tuple[str, ...]:
     """
     Загружает «плохие» слова из Pydantic-настроек (settings.bad_words_list).
-    Возвращает список (в нижнем регистре, без дубликатов).
+    Возвращает отсортированный кортеж (в нижнем регистре, без дубликатов).
+    Настройки неизменяемы, поэтому кортеж собирается один раз (_env_words) и
+    отдаётся без копирования; сбросить кэш — clear_words_cache().
     """
+    return _env_words()
+
+
+@lru_cache(maxsize=1)
+def _env_words() -> Tuple[str, ...]:
     settings = get_settings()
     raw = settings.bad_words_list  # ["badword1", "плохое_слово2", ...]
     cleaned = {w.strip().lower() for w in raw if w.strip()}
-    words = sorted(cleaned)
+    words = tuple(sorted(cleaned))
     logger.debug("Loaded %d bad words from ENV settings.", len(words))
     return words
 
 
-def load_words_from_file(filepath: str) -> List[str]:
+def _file_mtime(filepath: str) -> Optional[float]:
+    """mtime файла (ключ кэша) или None, если файла нет."""
+    try:
+        return os.path.getmtime(filepath)
+    except OSError:
+        return None
+
+
+def load_words_from_file(filepath: str) -> Tuple[str, ...]:
     """
     Считывает «плохие» слова из текстового файла (по строкам).
-    Возвращает список (нижний регистр, без дубликатов).
+    Возвращает отсортированный кортеж (нижний регистр, без дубликатов).
+    Результат кэшируется по (путь, mtime): файл читается заново только после
+    его изменения.
     """
-    if not os.path.exists(filepath):
+    return _file_words(filepath, _file_mtime(filepath))
+
+
+@lru_cache(maxsize=16)
+def _file_words(filepath: str, mtime: Optional[float]) -> Tuple[str, ...]:
+    if mtime is None:
         logger.warning("File with bad words not found: %s", filepath)
-        return []
+        return ()
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            lines = [line.strip().lower() for line in f if line.strip()]
-        cleaned = set(lines)
-        words = sorted(cleaned)
+            cleaned = {line.strip().lower() for line in f if line.strip()}
+        words = tuple(sorted(cleaned))
         logger.debug("Loaded %d bad words from file: %s", len(words), filepath)
         return words
     except Exception as e:
         logger.exception(
             "Error loading bad words from file=%s: %s", filepath, e)
-        return []
+        return ()
 
 
-def combine_bad_words(env_list: List[str], file_list: List[str]) -> List[str]:
+def combine_bad_words(env_list: Iterable[str], file_list: Iterable[str]) -> List[str]:
     """
     Объединяет два списка (ENV и FILE) в один (уникальный) список.
+    Принимает и кортежи из load_words_from_env / load_words_from_file.
     """
-    combined = set(env_list + file_list)
+    combined = set(env_list).union(file_list)
     result = sorted(combined)
     logger.info("Combined bad words total: %d", len(result))
     return result
 
+
+def _get_bad_words(file_path: str = "") -> FrozenSet[str]:
+    """
+    Слова ENV + file_path (если указан) из кэша: тот же frozenset, пока не
+    изменился mtime файла. Хэш frozenset вычисляется один раз, поэтому он
+    дёшев и как ключ _compile_blocklist.
+    """
+    mtime = _file_mtime(file_path) if file_path else None
+    return _combined_words(file_path, mtime)
+
+
+@lru_cache(maxsize=16)
+def _combined_words(file_path: str, mtime: Optional[float]) -> FrozenSet[str]:
+    words = frozenset(_env_words())
+    if file_path:
+        words |= frozenset(_file_words(file_path, mtime))
+    logger.info("Combined bad words total: %d", len(words))
+    return words
+
+
+# Скомпилированные выражения/автоматы: (слова, fuzzy) -> (pattern, длина
+# самого короткого слова). Один на процесс (воркер gunicorn), общий для всех клиентов и функций «одним вызовом».
+_BLOCKLIST_CACHE: LRUCache = LRUCache(maxsize=32)
+_blocklist_lock = threading.Lock()
+
+
+def _compile_blocklist(words: FrozenSet[str], fuzzy: bool) -> Tuple[Any, int]:
+    """
+    (pattern, min_word_len) для всего списка words: выражение
+    compile_bad_words_pattern (None, если список пуст) и длина самого
+    короткого слова (текст короче не сканируется). Общее для функций «одним
+    вызовом» и экземпляров ProfanityFilterClient: повторный вызов с тем же
+    набором слов и режимом берёт готовое из кэша.
+
+    Поиск и сборка — под одной блокировкой (LRUCache не потокобезопасен):
+    одновременные первые запросы воркера (потоки / greenlet'ы gevent) не
+    строят автомат каждый заново, а ждут первый.
+    """
+    key = (words, fuzzy)
+    with _blocklist_lock:
+        try:
+            return _BLOCKLIST_CACHE[key]
+        except KeyError:
+            compiled = (compile_bad_words_pattern(words, fuzzy=fuzzy),
+                         min(map(len, words), default=0))
+            _BLOCKLIST_CACHE[key] = compiled
+            return compiled
+
+
+def clear_words_cache() -> None:
+    """Сбрасывает кэши загруженных слов и скомпилированных выражений (для тестов)."""
+    _env_words.cache_clear()
+    _file_words.cache_clear()
+    _combined_words.cache_clear()
+    with _blocklist_lock:
+        _BLOCKLIST_CACHE.clear()
+
 # ------------------------------------------------------------------------------
 # 2. Функции «одним вызовом» (не обязательно пользоваться классом)
 # ------------------------------------------------------------------------------
@@ -95,28 +186,23 @@ def detect_words_once(
     file_path: str = ""
 ) -> List[str]:
     """
-    Выявляет, какие «плохие» слова присутствуют в тексте (игнорируем регистр).
+    Выявляет, какие «плохие» слова присутствуют в тексте (игнорируем регистр —
+    средствами самого выражения, без копии text.lower()).
     Возвращает список найденных.
 
     :param text: исходный текст
     :param fuzzy: True => ищем вхождения без границ (\b). False => \bслово\b
     :param file_path: файл со словами (дополнительно к ENV)
     """
-    env_words = load_words_from_env()
-    file_words = load_words_from_file(file_path) if file_path else []
-    bad_words = combine_bad_words(env_words, file_words)
-
-    found = []
-    text_lower = text.lower()
+    bad_words = _get_bad_words(file_path)
+    if not bad_words:
+        return []
 
-    for bw in bad_words:
-        if fuzzy:
-            pattern = re.compile(re.escape(bw), re.IGNORECASE)
-        else:
-            pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-        if pattern.search(text_lower):
-            found.append(bw)
-    return found
+    pattern, min_word_len = _compile_blocklist(bad_words, fuzzy)
+    if pattern is None:
+        return []
+    return detect_bad_words(
+        text, bad_words, pattern=pattern, min_word_len=min_word_len)
 
 
 def filter_text_once(
@@ -132,18 +218,14 @@ def filter_text_once(
     :param file_path: доп. файл
     :param placeholder: замена, default='***'
     """
-    env_words = load_words_from_env()
-    file_words = load_words_from_file(file_path) if file_path else []
-    bad_words = combine_bad_words(env_words, file_words)
+    bad_words = _get_bad_words(file_path)
+    if not bad_words:
+        # Пустой список (dev/тесты без ENV и файла): без блокировки и
+        # обращения к кэшу выражений
+        return text
 
-    filtered = text
-    for bw in bad_words:
-        if fuzzy:
-            pattern = re.compile(re.escape(bw), re.IGNORECASE)
-        else:
-            pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-        filtered = pattern.sub(placeholder, filtered)
-    return filtered
+    pattern, _min_word_len = _compile_blocklist(bad_words, fuzzy)
+    return replace_bad_words(text, bad_words, placeholder, pattern=pattern)
 
 
 def filter_with_positions_once(
@@ -158,33 +240,15 @@ def filter_with_positions_once(
         "filtered_text": str,
         "positions": List[(start, end, matched_str)]
       }
+    Позиции — в исходном тексте (один проход finditer и замена сразу).
     """
-    env_words = load_words_from_env()
-    file_words = load_words_from_file(file_path) if file_path else []
-    bad_words = combine_bad_words(env_words, file_words)
-
-    filtered = text
-    positions = []
-
-    for bw in bad_words:
-        if fuzzy:
-            pattern = re.compile(re.escape(bw), re.IGNORECASE)
-        else:
-            pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-
-        # найдём все вхождения
-        for match_obj in pattern.finditer(filtered):
-            start, end = match_obj.span()
-            matched_str = match_obj.group(0)
-            positions.append((start, end, matched_str))
+    bad_words = _get_bad_words(file_path)
+    if not bad_words:
+        return {"filtered_text": text, "positions": []}
 
-        # заменим
-        filtered = pattern.sub(placeholder, filtered)
-
-    return {
-        "filtered_text": filtered,
-        "positions": positions
-    }
+    pattern, _min_word_len = _compile_blocklist(bad_words, fuzzy)
+    return replace_bad_words_positions(
+        text, bad_words, placeholder, pattern=pattern)
 
 # ------------------------------------------------------------------------------
 # 3. Класс ProfanityFilterClient («боевой» клиент)
@@ -222,18 +286,23 @@ class ProfanityFilterClient:
         self.placeholder = placeholder
         self.file_path = file_path
 
-        # "Кэш" списка bad_words (ENV + FILE)
+        # "Кэш" списка bad_words (ENV + FILE) и выражение для всех слов сразу
         self.bad_words_cache: List[str] = []
+        self._pattern = None
+        # Длина самого короткого слова: более короткий текст не сканируем
+        self._min_word_len = 0
         self._loaded = False
 
     def load_words(self) -> None:
         """
         Загружает и кэширует bad_words из ENV + file_path (если указан).
         """
-        env_list = load_words_from_env()
-        file_list = load_words_from_file(
-            self.file_path) if self.file_path else []
-        self.bad_words_cache = combine_bad_words(env_list, file_list)
+        words = _get_bad_words(self.file_path)
+        self.bad_words_cache = sorted(words)
+        # Один автомат / одно выражение на весь список (None, если он пуст)
+        # и длина самого короткого слова — из общего кэша
+        self._pattern, self._min_word_len = _compile_blocklist(
+            words, self.fuzzy)
         self._loaded = True
         logger.debug("ProfanityFilterClient: loaded %d bad words (fuzzy=%s).", len(
             self.bad_words_cache), self.fuzzy)
@@ -245,36 +314,33 @@ class ProfanityFilterClient:
         if not self._loaded:
             self.load_words()
 
+    def _cannot_match(self, text: str) -> bool:
+        """
+        Дешёвая проверка до сканирования: список пуст или текст короче самого
+        короткого слова — тогда в тексте заведомо нет «плохих» слов.
+        """
+        return self._pattern is None or len(text) < self._min_word_len
+
     def detect_words(self, text: str) -> List[str]:
         """
         Список bad_words (из кэша), которые реально присутствуют в тексте.
+        Регистр не учитывает само выражение: копия text.lower() не создаётся.
         """
         self.ensure_loaded()
-        found = []
-        text_lower = text.lower()
-
-        for bw in self.bad_words_cache:
-            if self.fuzzy:
-                pattern = re.compile(re.escape(bw), re.IGNORECASE)
-            else:
-                pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-            if pattern.search(text_lower):
-                found.append(bw)
-        return found
+        if self._cannot_match(text):
+            return []
+        return detect_bad_words(
+            text, self.bad_words_cache, pattern=self._pattern)
 
     def filter_text(self, text: str) -> str:
         """
         Фильтрует (заменяет) bad_words, возвращает отфильтрованный текст.
         """
         self.ensure_loaded()
-        filtered = text
-        for bw in self.bad_words_cache:
-            if self.fuzzy:
-                pattern = re.compile(re.escape(bw), re.IGNORECASE)
-            else:
-                pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-            filtered = pattern.sub(self.placeholder, filtered)
-        return filtered
+        if self._cannot_match(text):
+            return text
+        return replace_bad_words(
+            text, self.bad_words_cache, self.placeholder, pattern=self._pattern)
 
     def filter_with_positions(self, text: str) -> Dict[str, Any]:
         """
@@ -283,30 +349,13 @@ class ProfanityFilterClient:
             "filtered_text": <...>,
             "positions": [ (start, end, matched_str), ...]
           }
+        Позиции — в исходном тексте (один проход finditer и замена сразу).
         """
         self.ensure_loaded()
-        filtered = text
-        positions = []
-
-        for bw in self.bad_words_cache:
-            if self.fuzzy:
-                pattern = re.compile(re.escape(bw), re.IGNORECASE)
-            else:
-                pattern = re.compile(rf"\b{re.escape(bw)}\b", re.IGNORECASE)
-
-            # Сначала найдём все вхождения
-            for match_obj in pattern.finditer(filtered):
-                start, end = match_obj.span()
-                matched_str = match_obj.group(0)
-                positions.append((start, end, matched_str))
-
-            # Потом заменяем
-            filtered = pattern.sub(self.placeholder, filtered)
-
-        return {
-            "filtered_text": filtered,
-            "positions": positions
-        }
+        if self._cannot_match(text):
+            return {"filtered_text": text, "positions": []}
+        return replace_bad_words_positions(
+            text, self.bad_words_cache, self.placeholder, pattern=self._pattern)
 
     def reload_words(self) -> None:
         """
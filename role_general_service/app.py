@@ -1,8 +1,9 @@
 import os
 import logging
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import openai
+import orjson
 
 # Предположим, вы хотите подключать роуты из role_general_routes.py,
 # если он реализован как Flask Blueprint (импортируем его).
@@ -18,7 +19,11 @@ logger = logging.getLogger(__name__)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
 
-openai.api_key = OPENAI_API_KEY
+# Один клиент на процесс: его HTTP-пул (httpx, keep-alive) переиспользуется
+# всеми запросами, а не открывает новое TLS-соединение к OpenAI на каждый.
+# В gevent-воркере gunicorn (gunicorn.conf.py) ожидание ответа уступает
+# управление другим запросам.
+openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
 
 DEFAULT_MAX_TOKENS = int(os.getenv("DEFAULT_MAX_TOKENS", 100))
 DEFAULT_TEMPERATURE = float(os.getenv("DEFAULT_TEMPERATURE", 0.7))
@@ -31,6 +36,12 @@ app = Flask(__name__)
 # (Опционально) регистрируем blueprint, если у вас есть routes/role_general_routes.py:
 # app.register_blueprint(role_general_blueprint, url_prefix="/api/role_general")
 
+
+def orjson_response(obj, status: int = 200) -> Response:
+    """JSON-ответ, сериализованный orjson (быстрее jsonify на больших ответах GPT)."""
+    return app.response_class(
+        orjson.dumps(obj), status=status, mimetype="application/json")
+
 # -----------------------------------------------------------------------------
 # Пример вспомогательной функции (адаптер для GPT),
 # если вы не выносите её в gpt_client.py (но лучше выносить).
@@ -47,7 +58,7 @@ def call_gpt_chatcompletion(
     logger.info(
         f"[call_gpt_chatcompletion] model={model}, max_tokens={max_tokens}, temperature={temperature}, top_p={top_p}")
     try:
-        response = openai.ChatCompletion.create(
+        response = openai_client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -57,7 +68,7 @@ def call_gpt_chatcompletion(
             temperature=temperature,
             top_p=top_p
         )
-        return response["choices"][0]["message"]["content"].strip()
+        return (response.choices[0].message.content or "").strip()
 
     except openai.RateLimitError as e:
         logger.warning(f"Rate limit reached: {e}")
@@ -145,33 +156,33 @@ def analyze_tz():
             top_p=1.0,
             model=OPENAI_MODEL
         )
-        import json
-        # Парсим JSON:
+        # Парсим JSON (orjson):
         parsed = {}
         error = None
         try:
-            parsed = json.loads(analysis_text)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(analysis_text)
+        except orjson.JSONDecodeError:
             error = "Invalid JSON from GPT"
 
-        return jsonify({
+        return orjson_response({
             "analysis_result": parsed if not error else None,
             "raw_response": analysis_text,
             "error": error
-        }), 200
+        }, 200)
 
     except openai.RateLimitError:
-        return jsonify({"error": "Rate limit reached, try again later."}), 429
+        return orjson_response({"error": "Rate limit reached, try again later."}, 429)
     except openai.APIConnectionError:
-        return jsonify({"error": "Failed to connect to OpenAI API."}), 503
+        return orjson_response({"error": "Failed to connect to OpenAI API."}, 503)
     except Exception as e:
         logger.exception(f"Unhandled error in /analyze-tz: {e}")
-        return jsonify({"error": str(e)}), 500
+        return orjson_response({"error": str(e)}, 500)
 
 
 # -----------------------------------------------------------------------------
 # Точка входа
 # -----------------------------------------------------------------------------
+# Только для локальной отладки. В продакшене: gunicorn -c gunicorn.conf.py wsgi:app
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5001))
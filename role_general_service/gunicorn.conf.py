@@ -0,0 +1,37 @@
+"""
+role_general_service/gunicorn.conf.py
+-------------------------------------
+Конфигурация gunicorn для Role General Service.
+
+По умолчанию используются gevent-воркеры: запросы /generate-text и
+/analyze-tz почти всё время ждут ответа OpenAI, поэтому один процесс с gevent
+обслуживает сотни одновременных запросов вместо одного.
+
+Запуск:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Параметры берутся из ENV (как и остальные настройки app.py):
+ - PORT
+ - ROLE_GENERAL_WORKERS
+ - ROLE_GENERAL_WORKER_CLASS
+ - ROLE_GENERAL_WORKER_CONNECTIONS
+"""
+
+import os
+
+bind = f"0.0.0.0:{int(os.getenv('PORT', 5001))}"
+workers = int(os.getenv("ROLE_GENERAL_WORKERS", 4))
+worker_class = os.getenv("ROLE_GENERAL_WORKER_CLASS", "gevent")
+worker_connections = int(os.getenv("ROLE_GENERAL_WORKER_CONNECTIONS", 200))
+
+# Запрос к OpenAI может идти десятки секунд: стандартные 30 с таймаута
+# воркера обрывали бы длинные генерации
+timeout = int(os.getenv("ROLE_GENERAL_WORKER_TIMEOUT", 120))
+
+# Приложение импортируется в каждом воркере после fork: HTTP-пул клиента
+# OpenAI не должен делиться между процессами.
+preload_app = False
+
+# Логи gunicorn — в stdout/stderr (как и у самого сервиса)
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,13 @@
+"""
+role_general_service/wsgi.py
+----------------------------
+Точка входа для продакшен WSGI-сервера (gunicorn).
+
+Встроенный сервер Flask (app.run) обрабатывает запросы по одному и не умеет
+перекрывать ожидание ответа OpenAI, поэтому в контейнере сервис запускается так:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Настройки воркеров (gevent, число процессов и соединений) — в gunicorn.conf.py.
+"""
+
+from app import app  # noqa: F401